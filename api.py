@@ -0,0 +1,156 @@
+"""
+api.py - Read-only JSON-API fuer den Signal-Snapshot, ohne Streamlit.
+
+Dashboards, Bots und Widgets brauchen denselben Status der 8 Signale, ohne je eine
+Streamlit-Session zu starten. Die API nutzt denselben Hintergrund-Worker wie das Dashboard
+(refresh_worker): Quellen und df_merged werden im Rhythmus von REFRESH_CONFIG aktualisiert,
+Signalstatus und Preislevels werden pro Snapshot genau einmal berechnet und serialisiert.
+Alle Clients bekommen danach dieselben Bytes mit demselben ETag, bedingte Anfragen
+(If-None-Match) werden mit 304 ohne Body beantwortet.
+
+Endpunkte:
+    GET /v1/signals   Status der 8 Signale (wie cli.py signals --json), Preislevels, Quellenstatus
+    GET /health       200, sobald ein Snapshot vorliegt, sonst 503
+
+Aufruf:
+    python api.py                          # http://127.0.0.1:8502 (API_CONFIG)
+    python api.py --host 0.0.0.0 --port 8080
+"""
+
+import argparse
+import json
+import logging
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import cache
+from config import API_CONFIG
+from refresh_worker import get_refresh_worker
+from strategy import calculate_price_levels, get_signal_status, price_levels_payload, signal_status_payload
+
+
+def build_payload(snapshot):
+    """Antwort von /v1/signals fuer einen erfolgreichen Snapshot, dict mit JSON-Typen."""
+    df_merged = snapshot.df_merged
+    payload = signal_status_payload(get_signal_status(df_merged, *snapshot.onchain), df_merged.index[-1])
+    payload['price_levels'] = price_levels_payload(calculate_price_levels(df_merged))
+    payload['sources'] = dict(snapshot.source_status)
+    return payload
+
+
+class SnapshotPayloads:
+    """Serialisiert jeden Snapshot des Workers genau einmal, danach nur noch Lesezugriffe."""
+
+    def __init__(self, worker):
+        self._worker = worker
+        self._snapshot = None
+        self._response = None
+        self._lock = threading.Lock()
+
+    def current(self):
+        """
+        Returns:
+        (status, body, etag): 200 mit JSON und ETag, 503 solange kein Snapshot mit Marktdaten
+        vorliegt (etag None)
+        """
+        snapshot = self._worker.latest()
+        if snapshot is None:
+            return 503, _json_bytes({"error": "Daten werden noch geladen"}), None
+        with self._lock:
+            if snapshot is not self._snapshot:
+                self._response = self._render(snapshot)
+                self._snapshot = snapshot
+            return self._response
+
+    @staticmethod
+    def _render(snapshot):
+        if not snapshot.success:
+            return 503, _json_bytes({"error": snapshot.message, "sources": snapshot.source_status}), None
+        body = _json_bytes(build_payload(snapshot))
+        # Inhaltsbasiert: ein Refresh ohne neue Werte aendert den ETag nicht
+        return 200, body, f'"{zlib.crc32(body):08x}"'
+
+
+def _json_bytes(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def make_handler(payloads):
+    class ApiHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self._respond(send_body=True)
+
+        def do_HEAD(self):
+            self._respond(send_body=False)
+
+        def _respond(self, send_body):
+            path = urlsplit(self.path).path.rstrip("/")
+            if path not in ("/v1/signals", "/health"):
+                self._send(404, _json_bytes({"error": f"unknown endpoint {path or '/'}"}), send_body=send_body)
+                return
+
+            status, body, etag = payloads.current()
+            if path == "/health":
+                self._send(status, _json_bytes({"ready": status == 200}), send_body=send_body)
+            elif status != 200:
+                self._send(status, body, {"Retry-After": "5"}, send_body)
+            elif _etag_matches(self.headers.get("If-None-Match"), etag):
+                self._send(304, b"", self._cache_headers(etag), send_body)
+            else:
+                self._send(200, body, self._cache_headers(etag), send_body)
+
+        @staticmethod
+        def _cache_headers(etag):
+            return {"ETag": etag, "Cache-Control": f"public, max-age={API_CONFIG['MAX_AGE']}"}
+
+        def _send(self, status, body, headers=None, send_body=True):
+            self.send_response(status)
+            if status != 304:
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            if send_body and status != 304:
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logging.info("api %s - %s", self.address_string(), format % args)
+
+    return ApiHandler
+
+
+def serve(host, port):
+    payloads = SnapshotPayloads(get_refresh_worker())
+    server = ThreadingHTTPServer((host, port), make_handler(payloads))
+    logging.info("Signal API listening on http://%s:%d", host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Read-only JSON-API fuer den Signal-Snapshot")
+    parser.add_argument("--host", default=API_CONFIG["HOST"])
+    parser.add_argument("--port", type=int, default=API_CONFIG["PORT"])
+    args = parser.parse_args()
+    # Ein Prozess ohne Streamlit: der Worker wird im Speicher-Cache gehalten
+    cache.set_backend("memory")
+    serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+import_time.py - Startup-Report: Importzeiten der Einstiegspunkte per `python -X importtime`.
+
+Importiert jedes Ziel-Modul mehrmals in einem frischen Interpreter (Median der Laeufe),
+wertet die importtime-Ausgabe aus und zeigt pro Ziel die Gesamtzeit, die teuersten
+Top-Level-Pakete (kumulativ) und ob die schweren, nur fuer einzelne Features gebrauchten
+Module (Plotly-Figuren, yfinance) schon beim Start geladen werden.
+
+Aufruf (aus dem Repo-Verzeichnis):
+    python benchmarks/import_time.py                          # main, cli, helpers
+    python benchmarks/import_time.py --targets main --runs 5
+    python benchmarks/import_time.py --output startup_report.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+
+DEFAULT_TARGETS = ["main", "cli", "helpers"]
+
+# Module, die erst beim ersten Chart bzw. Kursabruf geladen werden sollen. Von plotly
+# laedt Streamlit selbst beim Import einen Teil (Theme), gezaehlt wird deshalb erst die
+# Figure-Klasse, die go.Figure() nachzieht.
+LAZY_MODULES = ["plotly.graph_objs._figure", "yfinance"]
+
+
+def _parse_importtime(stderr):
+    """
+    Returns:
+    dict Modul -> (self_us, cumulative_us) fuer alle importierten Module. Bei mehrfach
+    auftauchenden Namen zaehlt der erste (tatsaechliche) Import.
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        modules.setdefault(name.strip(), (int(self_us), int(cumulative_us)))
+    return modules
+
+
+def measure(target):
+    """Ein Import von target in einem frischen Interpreter, dict Modul -> (self_us, cumulative_us)."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {target}"],
+                            cwd=REPO_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{result.stderr[-2000:]}")
+    return _parse_importtime(result.stderr)
+
+
+def summarize(target, runs, top):
+    """Misst target `runs`-mal, Report mit Median-Zeiten (in ms)."""
+    measurements = [measure(target) for _ in range(runs)]
+    by_package = {}
+    for modules in measurements:
+        packages = {}
+        for name, (_, cumulative_us) in modules.items():
+            package = name.split(".")[0]
+            # Kumulative Zeit des obersten Moduls eines Pakets enthaelt alle Untermodule
+            if name == package:
+                packages[package] = cumulative_us
+        for package, cumulative_us in packages.items():
+            by_package.setdefault(package, []).append(cumulative_us)
+
+    total_ms = statistics.median(modules[target][1] for modules in measurements) / 1000
+    heaviest = sorted(((package, statistics.median(values) / 1000) for package, values in by_package.items()
+                       if package != target), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "target": target,
+        "runs": runs,
+        "total_ms": round(total_ms, 1),
+        "modules": len(measurements[-1]),
+        "heaviest": [{"package": package, "cumulative_ms": round(ms, 1)} for package, ms in heaviest],
+        "lazy_loaded_at_start": [module for module in LAZY_MODULES if module in measurements[-1]],
+    }
+
+
+def print_report(report):
+    for entry in report:
+        print(f"\nimport {entry['target']}: {entry['total_ms']:.0f} ms, "
+              f"{entry['modules']} Module (Median aus {entry['runs']} Laeufen)")
+        for item in entry["heaviest"]:
+            print(f"  {item['package']:<28} {item['cumulative_ms']:>8.1f} ms")
+        if entry["lazy_loaded_at_start"]:
+            print(f"  WARNUNG: beim Start geladen: {', '.join(entry['lazy_loaded_at_start'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importzeiten der Einstiegspunkte")
+    parser.add_argument("--targets", nargs="+", default=DEFAULT_TARGETS, help="Module, die importiert werden")
+    parser.add_argument("--runs", type=int, default=3, help="Laeufe pro Modul, berichtet wird der Median")
+    parser.add_argument("--top", type=int, default=10, help="Anzahl der teuersten Pakete im Report")
+    parser.add_argument("--output", help="Report zusaetzlich als JSON speichern")
+    parser.add_argument("--fail-on-lazy", action="store_true",
+                        help="Exit-Code 1, wenn Plotly-Figuren oder yfinance beim Start geladen werden (CI)")
+    args = parser.parse_args()
+
+    report = [summarize(target, args.runs, args.top) for target in args.targets]
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport gespeichert: {args.output}")
+    if args.fail_on_lazy and any(entry["lazy_loaded_at_start"] for entry in report):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+run_benchmarks.py - Offline-Benchmarks fuer Daten-Pipeline, Strategie und Chart-Builder.
+
+Misst jede Pipeline-Stufe auf synthetischen Daten (benchmarks/synthetic_data.py) in
+mehreren Groessen, mit Laufzeit (Minimum und Median ueber mehrere Wiederholungen) und
+Spitzen-Speicher (tracemalloc). Die Ergebnisse werden mit einer gespeicherten Baseline
+verglichen, Verschlechterungen ueber der Toleranz werden als REGRESSION markiert.
+
+Aufruf (aus dem Repo-Verzeichnis):
+    python benchmarks/run_benchmarks.py                       # alle Groessen, Vergleich mit Baseline
+    python benchmarks/run_benchmarks.py --sizes 3000 30000    # nur diese Groessen
+    python benchmarks/run_benchmarks.py --save-baseline       # aktuelle Messung als Baseline speichern
+    python benchmarks/run_benchmarks.py --fail-on-regression  # Exit-Code 1 bei Regression (CI)
+
+Es werden keine Netzwerkzugriffe gemacht. Der lokale Datenspeicher zeigt waehrend des
+Laufs auf ein temporaeres Verzeichnis, damit die echten Daten unberuehrt bleiben.
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+# Muss vor dem Import von config gesetzt sein
+_STORE_DIR = tempfile.mkdtemp(prefix="dashboard-bench-")
+os.environ["DASHBOARD_DATA_DIR"] = _STORE_DIR
+
+from config import INDICATORS  # noqa: E402
+from chart_pyramid import build_pyramid  # noqa: E402
+from data_processing import _daily_close_history, _process_and_merge_data, calculate_sell_and_buy_history  # noqa: E402
+from multi_asset import _to_daily_index, compute_asset_indicators  # noqa: E402
+from quantiles import reset_expanding_quantiles  # noqa: E402
+from strategy import calculate_price_levels, get_signal_status  # noqa: E402
+from ui_components import (create_fear_greed_chart, create_mayer_multiple_chart,  # noqa: E402
+                           create_mvrv_meter, create_price_chart)
+from synthetic_data import generate  # noqa: E402
+
+DEFAULT_SIZES = [3_000, 30_000, 300_000, 1_000_000]
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+MULTI_ASSETS = 4
+
+MERGE_ARGS = (
+    INDICATORS.get("LOWER_MM_QUANTIL"), INDICATORS.get("UPPER_MM_QUANTIL"),
+    INDICATORS.get("LOWER_FEAR_AND_GREED"), INDICATORS.get("UPPER_FEAR_AND_GREED"),
+    INDICATORS.get("BIGGER_SMA"), INDICATORS.get("SMALLER_SMA"),
+)
+
+
+def _clear_store():
+    for entry in os.listdir(_STORE_DIR):
+        os.remove(os.path.join(_STORE_DIR, entry))
+    reset_expanding_quantiles()
+
+
+def _asset_closes(df_historical_btc, assets):
+    """Breiter Frame mit `assets` Kursreihen: BTC plus verrauschte, spaeter startende Varianten."""
+    close = df_historical_btc["Close"].to_numpy()
+    rng = np.random.default_rng(1)
+    columns = {"BTC": close}
+    for i in range(1, assets):
+        noise = np.exp(np.cumsum(rng.normal(0, 0.01, len(close))))
+        columns[f"ASSET{i}"] = np.where(np.arange(len(close)) >= i * len(close) // (2 * assets), close * noise, np.nan)
+    return pd.DataFrame(columns, index=_to_daily_index(df_historical_btc.index))
+
+
+def _stages(df_historical_btc, df_fear_and_greed, df_merged):
+    """Alle gemessenen Stufen als (Name, Funktion, Setup) mit Setup vor jeder Wiederholung."""
+    df_closes = _asset_closes(df_historical_btc, MULTI_ASSETS)
+    return [
+        ("merge_cold", lambda: _process_and_merge_data(df_historical_btc, df_fear_and_greed, *MERGE_ARGS), _clear_store),
+        ("merge_warm", lambda: _process_and_merge_data(df_historical_btc, df_fear_and_greed, *MERGE_ARGS), None),
+        ("timeframes", lambda: build_pyramid(df_merged, _daily_close_history(df_historical_btc)), None),
+        ("sell_and_buy_history", lambda: calculate_sell_and_buy_history(df_merged), None),
+        ("signal_status", lambda: get_signal_status(df_merged, 20_000.0, 2.1, 1.3e12, 6.5e11), None),
+        ("price_levels", lambda: calculate_price_levels(df_merged), None),
+        (f"multi_asset_{MULTI_ASSETS}", lambda: compute_asset_indicators(df_closes, df_fear_and_greed), None),
+        ("price_chart", lambda: create_price_chart(df_merged, 20_000.0).to_json(), None),
+        ("mayer_multiple_chart", lambda: create_mayer_multiple_chart(df_merged).to_json(), None),
+        ("fear_greed_chart", lambda: create_fear_greed_chart(df_merged).to_json(), None),
+        ("mvrv_meter", lambda: create_mvrv_meter(2.1).to_json(), None),
+    ]
+
+
+def _measure(func, setup, repeat):
+    """Laufzeit ueber `repeat` Wiederholungen plus Spitzen-Speicher eines separaten Laufs."""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"min_s": min(timings), "median_s": statistics.median(timings), "peak_mb": peak / 1e6}
+
+
+def run(sizes, repeat):
+    """Fuehrt alle Stufen fuer alle Groessen aus, Ergebnis: dict "stufe@zeilen" -> Messwerte."""
+    results = {}
+    for rows in sizes:
+        df_historical_btc, df_fear_and_greed = generate(rows)
+        _clear_store()
+        df_merged = _process_and_merge_data(df_historical_btc, df_fear_and_greed, *MERGE_ARGS)
+        stage_repeat = repeat if rows <= 30_000 else max(1, repeat // 3)
+        for name, func, setup in _stages(df_historical_btc, df_fear_and_greed, df_merged):
+            key = f"{name}@{rows}"
+            results[key] = _measure(func, setup, stage_repeat)
+            print(f"{key:<32} min {results[key]['min_s'] * 1000:10.2f} ms   "
+                  f"median {results[key]['median_s'] * 1000:10.2f} ms   peak {results[key]['peak_mb']:9.1f} MB",
+                  flush=True)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Vergleicht mit der Baseline (Minimum-Laufzeit und Speicher), Liste der Regressionen."""
+    regressions = []
+    print(f"\n{'stage':<32} {'time vs baseline':>18} {'memory vs baseline':>20}")
+    for key, current in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            print(f"{key:<32} {'(no baseline)':>18}")
+            continue
+        time_ratio = current["min_s"] / reference["min_s"] if reference["min_s"] else 1.0
+        memory_ratio = current["peak_mb"] / reference["peak_mb"] if reference["peak_mb"] else 1.0
+        flag = ""
+        if time_ratio > 1 + tolerance or memory_ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        print(f"{key:<32} {time_ratio:>17.2f}x {memory_ratio:>19.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline-Benchmarks fuer das BTC Strategy Dashboard")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Zeilenzahlen der synthetischen Daten")
+    parser.add_argument("--repeat", type=int, default=5, help="Wiederholungen pro Stufe")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Pfad der Baseline-Datei")
+    parser.add_argument("--save-baseline", action="store_true", help="Messung als neue Baseline speichern")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Erlaubte Verschlechterung (0.25 = 25%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit-Code 1 bei Regression")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    try:
+        results = run(args.sizes, args.repeat)
+    finally:
+        shutil.rmtree(_STORE_DIR, ignore_errors=True)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}, run with --save-baseline first.")
+        return
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+synthetic_data.py - Synthetische BTC- und Fear & Greed Daten fuer Offline-Benchmarks.
+
+Die Frames haben dieselbe Form wie die echten Quellen: die BTC-Historie wie
+yfinance.Ticker.history() (tz-aware DatetimeIndex "Date", Open/High/Low/Close/Volume,
+Dividends, Stock Splits), der Fear & Greed Index wie der geparste alternative.me
+JSON (value als String, neueste Zeile zuerst).
+
+Bis MAX_DAILY_ROWS Zeilen sind es Tageskerzen, darueber Stundenkerzen, damit auch
+1M Zeilen noch in den von pandas darstellbaren Datumsbereich passen.
+"""
+
+import numpy as np
+import pandas as pd
+
+MAX_DAILY_ROWS = 50_000
+
+
+def generate(rows, seed=0, start="2012-01-01"):
+    """
+    Erzeugt (df_historical_btc, df_fear_and_greed) mit `rows` Zeilen.
+    Der Preis ist eine geometrische Brownsche Bewegung, F&G ein begrenzter Random Walk.
+    """
+    rng = np.random.default_rng(seed)
+    freq = "D" if rows <= MAX_DAILY_ROWS else "h"
+    index = pd.date_range(start, periods=rows, freq=freq, tz="UTC", name="Date")
+
+    # Drift und Volatilitaet pro Kerze an die Kerzenlaenge angepasst, damit der Kurs auch
+    # bei 1M Stundenkerzen im float-Bereich bleibt
+    step = 1.0 if freq == "D" else 1 / 24
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005 * step, 0.035 * np.sqrt(step), rows)))
+    df_historical_btc = pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.01, rows)),
+        "High": close * (1 + np.abs(rng.normal(0, 0.02, rows))),
+        "Low": close * (1 - np.abs(rng.normal(0, 0.02, rows))),
+        "Close": close,
+        "Volume": rng.uniform(1e8, 5e10, rows),
+        "Dividends": 0.0,
+        "Stock Splits": 0.0,
+    }, index=index)
+
+    # Random Walk, an 0 und 100 reflektiert
+    fear_and_greed = np.abs((50 + np.cumsum(rng.normal(0, 4, rows))) % 200 - 100).round().astype(int)
+    df_fear_and_greed = pd.DataFrame({
+        "value": fear_and_greed.astype(str),
+        "value_classification": "Neutral",
+        "date": index.tz_localize(None),
+    }).iloc[::-1].reset_index(drop=True)
+
+    return df_historical_btc, df_fear_and_greed
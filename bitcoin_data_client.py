@@ -0,0 +1,178 @@
+"""
+bitcoin_data_client.py - Client fuer bitcoin-data.com mit prozessuebergreifendem Anfragekontingent.
+
+Der Free Tier erlaubt 10 Anfragen pro Stunde, gezaehlt pro API-Nutzer, nicht pro Prozess.
+Das Kontingent wird deshalb als Token-Bucket in einem Ledger im lokalen Datenspeicher
+gefuehrt (Datei-Lock, atomares Schreiben), den alle Prozesse und Neustarts teilen. Im
+selben Ledger liegt pro Metrik der letzte gute Wert mit Zeitstempel:
+
+- Wert juenger als FRESH_FOR: wird ohne Anfrage geliefert.
+- Sonst, falls ein Token frei ist: Anfrage, der Wert wird im Ledger gespeichert.
+- Kein Token frei oder Anfrage fehlgeschlagen: letzter guter Wert (mit Alter) oder None.
+
+Antwortet die API mit 429, wird der Bucket geleert, damit auch die anderen Prozesse
+bis zum Nachfuellen keine Anfragen mehr schicken.
+"""
+
+import logging
+import time
+
+import pandas as pd
+
+import http_client
+from config import BITCOIN_DATA_CONFIG, upstream_url
+from data_store import load_json, locked, save_json
+
+LEDGER_NAME = "bitcoin_data_ledger"
+
+# path -> Ledger-Eintrag plus Grund, wenn der letzte Abruf in diesem Prozess statt eines
+# neuen Werts nur den gespeicherten liefern konnte (Kontingent, 429, Fehler)
+_fallbacks = {}
+
+# Metriken: Pfad -> (JSON-Schluessel, Anzeigename)
+METRICS = {
+    "mvrv-zscore": ("mvrvZscore", "MVRV-Z"),
+    "market-cap": ("marketCap", "Marktkapitalisierung"),
+    "realized-cap": ("realizedCap", "realisierte Kapitalisierung"),
+}
+
+
+def _load_ledger(now):
+    """Ledger mit auf `now` nachgefuelltem Token-Bucket."""
+    capacity = BITCOIN_DATA_CONFIG["REQUESTS_PER_HOUR"]
+    ledger = load_json(LEDGER_NAME) or {}
+    tokens = ledger.get("tokens", capacity)
+    updated = ledger.get("updated", now)
+    ledger["tokens"] = min(capacity, tokens + max(0.0, now - updated) * capacity / 3600)
+    ledger["updated"] = now
+    ledger.setdefault("values", {})
+    return ledger
+
+
+def _reserve(path=None):
+    """
+    Entscheidet unter Lock, ob fuer path eine Anfrage geschickt wird, und zieht dann ein Token ab.
+    Ohne path (Historien-Abruf) gibt es keine Frische-Pruefung.
+    Returns:
+    ("fresh" | "fetch" | "budget", letzter gespeicherter Eintrag oder None)
+    """
+    now = time.time()
+    with locked(LEDGER_NAME):
+        ledger = _load_ledger(now)
+        entry = ledger["values"].get(path) if path is not None else None
+        if entry is not None and now - entry["fetched_at"] < BITCOIN_DATA_CONFIG["FRESH_FOR"]:
+            return "fresh", entry
+        if ledger["tokens"] < 1:
+            return "budget", entry
+        ledger["tokens"] -= 1
+        save_json(LEDGER_NAME, ledger)
+        return "fetch", entry
+
+
+def _record(path, value=None, date=None, rate_limited=False):
+    """Speichert einen neuen Wert (mit dem Tag aus dem Feld "d" der Antwort) bzw. leert den
+    Bucket nach einer 429-Antwort. Returns: der neue Eintrag oder None."""
+    now = time.time()
+    entry = None
+    with locked(LEDGER_NAME):
+        ledger = _load_ledger(now)
+        if rate_limited:
+            ledger["tokens"] = 0.0
+        if value is not None:
+            entry = ledger["values"][path] = {"value": value, "date": date, "fetched_at": now}
+        save_json(LEDGER_NAME, ledger)
+    return entry
+
+
+def _cached_entry(path, entry, reason):
+    if entry is None:
+        logging.warning("No bitcoin-data.com value for %s available (%s).", path, reason)
+        _fallbacks.pop(path, None)
+        return None
+    _fallbacks[path] = dict(entry, reason=reason)
+    logging.info("Serving %s from the ledger (%s), %.1fh old.", path, reason,
+                 (time.time() - entry["fetched_at"]) / 3600)
+    return dict(entry, cached=True)
+
+
+def _get(path, suffix=""):
+    """Eine Anfrage an bitcoin-data.com (Token muss bereits reserviert sein).
+    Returns: JSON der Antwort, None bei 429 (Bucket wird geleert). Wirft bei anderen Fehlern."""
+    url = upstream_url(f"{BITCOIN_DATA_CONFIG['BASE_URL']}/{path}{suffix}")
+    # Ohne automatische Wiederholungen: jeder Versuch belastet das Kontingent
+    resp = http_client.get(url, timeout=BITCOIN_DATA_CONFIG["TIMEOUT"], retry=False)
+    if resp.status_code == 429:
+        _record(path, rate_limited=True)
+        return None
+    resp.raise_for_status()
+    return resp.json()
+
+
+def fetch_last_entry(path, key):
+    """
+    Letzter Wert einer Metrik (/v1/<path>/last), unter Beachtung des Kontingents.
+    Returns: dict {"value", "date", "fetched_at", "cached"} oder None, wenn weder live noch im
+    Ledger ein Wert vorliegt. date ist der Tag, zu dem der Wert gehoert (ISO-String aus "d",
+    None bei Eintraegen aelterer Versionen), cached ist True, wenn der Wert ohne neue Anfrage
+    aus dem Ledger kommt.
+    """
+    decision, entry = _reserve(path)
+    if decision == "fresh":
+        _fallbacks.pop(path, None)
+        return dict(entry, cached=True)
+    if decision == "budget":
+        return _cached_entry(path, entry, "request budget spent")
+
+    try:
+        data_json = _get(path, "/last")
+        if data_json is None:
+            return _cached_entry(path, entry, "rate limited by upstream")
+        value = data_json.get(key)
+    except Exception as e:
+        logging.warning("Failed to fetch %s from bitcoin-data.com: %s", path, e)
+        return _cached_entry(path, entry, "request failed")
+
+    if value is None:
+        return _cached_entry(path, entry, f"no '{key}' in response")
+    _fallbacks.pop(path, None)
+    return dict(_record(path, float(value), data_json.get("d")), cached=False)
+
+
+def fetch_last(path, key):
+    """Wie fetch_last_entry, nur der Wert: float oder None."""
+    entry = fetch_last_entry(path, key)
+    return entry["value"] if entry is not None else None
+
+
+def fetch_history(path, key):
+    """
+    Komplette Historie einer Metrik (/v1/<path>), kostet ein Token.
+    Returns: pd.Series (float, DatetimeIndex "date") oder None, wenn das Kontingent
+    aufgebraucht ist oder die Anfrage fehlschlaegt.
+    """
+    decision, _ = _reserve()
+    if decision == "budget":
+        logging.warning("Request budget spent, skipping history of %s.", path)
+        return None
+    try:
+        data_json = _get(path)
+    except Exception as e:
+        logging.warning("Failed to fetch history of %s from bitcoin-data.com: %s", path, e)
+        return None
+    if data_json is None:
+        logging.warning("Rate limited while fetching history of %s.", path)
+        return None
+    df = pd.DataFrame(data_json)
+    series = pd.to_numeric(df[key], errors="coerce")
+    series.index = pd.DatetimeIndex(pd.to_datetime(df["d"]).dt.normalize(), name="date")
+    return series.dropna().sort_index()
+
+
+def fallback_entries():
+    """
+    Werte, die beim letzten fetch_last_entry in diesem Prozess nur aus dem Ledger kamen, weil
+    das Kontingent aufgebraucht war, die API mit 429 antwortete oder die Anfrage fehlschlug.
+    Ein Wert, der nur noch nicht faellig war (juenger als FRESH_FOR), zaehlt nicht dazu.
+    Returns: dict path -> {"value", "date", "fetched_at", "reason"}
+    """
+    return dict(_fallbacks)
@@ -0,0 +1,138 @@
+"""
+cache.py - Cache-Decorators der Daten-Schicht mit austauschbarem Backend.
+
+data_processing nutzt cache_data / cache_resource aus diesem Modul statt der
+Streamlit-Decorators, damit Fetch-, Merge- und Strategie-Code ohne Streamlit importierbar
+bleibt (CLI, Cronjobs). Backends:
+
+- "streamlit": st.cache_data / st.cache_resource, geteilt ueber alle Sessions
+- "memory": TTL-Cache im Prozess, begrenzt auf max_entries
+- "none": kein Cache
+
+Das Backend wird beim ersten Aufruf einer gecachten Funktion festgelegt: per set_backend()
+oder DASHBOARD_CACHE_BACKEND, sonst "streamlit", wenn Streamlit im Prozess bereits geladen
+ist (Dashboard), und "memory" andernfalls. Wie bei Streamlit gehen Argumente mit
+fuehrendem Unterstrich nicht in den Schluessel ein, cache_data liefert Kopien,
+cache_resource das gespeicherte Objekt selbst. clear() verwirft alle Eintraege einer Funktion.
+"""
+
+import copy
+import functools
+import inspect
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+BACKENDS = ("streamlit", "memory", "none")
+
+_backend = os.environ.get("DASHBOARD_CACHE_BACKEND")
+
+
+def set_backend(name):
+    """Legt das Backend fest, wirkt auf alle Funktionen, die noch nicht aufgerufen wurden."""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown cache backend {name!r}, expected one of {BACKENDS}")
+    _backend = name
+
+
+def active_backend():
+    if _backend:
+        return _backend
+    return "streamlit" if "streamlit" in sys.modules else "memory"
+
+
+class _MemoryCache:
+    """Thread-sicherer TTL-Cache pro Funktion, aelteste Eintraege fliegen zuerst."""
+
+    def __init__(self, func, ttl, max_entries, copy_results):
+        self._func = func
+        self._signature = inspect.signature(func)
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._copy_results = copy_results
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, args, kwargs):
+        bound = self._signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple((name, value) for name, value in bound.arguments.items() if not name.startswith("_"))
+        try:
+            hash(key)
+            return key
+        except TypeError:
+            return pickle.dumps(key)
+
+    def _result(self, value):
+        return copy.deepcopy(value) if self._copy_results else value
+
+    def __call__(self, *args, **kwargs):
+        key = self._key(args, kwargs)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self._ttl is None or time.monotonic() - entry[0] < self._ttl):
+                self._entries.move_to_end(key)
+                return self._result(entry[1])
+
+        value = self._func(*args, **kwargs)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while self._max_entries is not None and len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return self._result(value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class _CachedFunction:
+    """Gecachte Funktion, deren Backend erst beim ersten Aufruf gewaehlt wird."""
+
+    def __init__(self, func, kind, ttl, max_entries, show_spinner):
+        functools.update_wrapper(self, func)
+        self._func = func
+        self._kind = kind
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._show_spinner = show_spinner
+        self._impl = None
+        self._lock = threading.Lock()
+
+    def _resolve(self):
+        with self._lock:
+            if self._impl is None:
+                backend = active_backend()
+                if backend == "streamlit":
+                    import streamlit as st
+                    decorator = st.cache_data if self._kind == "data" else st.cache_resource
+                    self._impl = decorator(ttl=self._ttl, max_entries=self._max_entries,
+                                           show_spinner=self._show_spinner)(self._func)
+                elif backend == "memory":
+                    self._impl = _MemoryCache(self._func, self._ttl, self._max_entries,
+                                              copy_results=self._kind == "data")
+                else:
+                    self._impl = self._func
+            return self._impl
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def clear(self):
+        if self._impl is not None and hasattr(self._impl, "clear"):
+            self._impl.clear()
+
+
+def cache_data(ttl=None, max_entries=None, show_spinner=True):
+    """Wie st.cache_data: fuer serialisierbare Ergebnisse, jeder Aufrufer bekommt eine Kopie."""
+    return lambda func: _CachedFunction(func, "data", ttl, max_entries, show_spinner)
+
+
+def cache_resource(ttl=None, max_entries=None, show_spinner=True):
+    """Wie st.cache_resource: das gespeicherte Objekt wird geteilt, Aufrufer duerfen es nicht veraendern."""
+    return lambda func: _CachedFunction(func, "resource", ttl, max_entries, show_spinner)
@@ -0,0 +1,110 @@
+"""
+chart_pyramid.py - Tages-, Wochen- und Monatsdaten fuer Zeitrahmen und Zoom der Charts.
+
+Pro Daten-Refresh wird df_merged einmal zu Tages-, Wochen- und Monatswerten verdichtet
+(Kurs, SMAs und Quantil-Preislevel: letzter Wert der Periode, Fear & Greed: Mittelwert der
+Periode). Im selben Durchgang kommen die Indikatoren des Zeitrahmens dazu
+(TIMEFRAME_CONFIG): der gleitende Durchschnitt ueber die Wochen- bzw. Monatsschlusskurse
+(z.B. 200-Wochen MA) und das Mayer Multiple darauf. Sie werden aus der ganzen
+Kurshistorie berechnet, nicht nur aus dem Zeitraum von df_merged, sonst gaebe es den
+200-Wochen MA erst knapp vier Jahre nach Beginn des Fear & Greed Index.
+
+Gebaut wird die Pyramide zusammen mit df_merged im gecachten Merge
+(data_processing.process_and_merge_timeframes), ein Wechsel des Zeitrahmens rechnet nichts
+neu. Fuer einen gewaehlten Zeitraum wird per binaerer Suche auf dem DatetimeIndex
+geschnitten und die feinste Aufloesung genommen, die ins Zeilen-Budget passt. Jede
+verdichtete Zeile traegt das Datum ihres letzten Tages, so endet auch die Wochen- und
+Monatsreihe exakt am letzten Datenpunkt.
+"""
+
+import pandas as pd
+
+from config import INDICATORS, TIMEFRAME_CONFIG
+
+# Feinste zuerst
+RESOLUTIONS = {
+    "D": "Tag",
+    "W": "Woche",
+    "M": "Monat",
+}
+
+# Perioden fuer to_period: Wochen enden am Sonntag, wie resample("W")
+_PERIOD_FREQS = {"W": "W", "M": "M"}
+
+
+def _aggregations(columns):
+    """Aggregation pro Chart-Spalte, nur fuer Spalten, die in df_merged vorhanden sind."""
+    last_columns = [
+        "close", "200_days_sma_for_mm", f"{INDICATORS.get('BIGGER_SMA')}_day_ma",
+        f"{INDICATORS.get('SMALLER_SMA')}_day_ma", "mayer_multiple", "q90_expanding", "q10_expanding",
+        "q90_price_level", "q10_price_level",
+    ]
+    aggregations = {column: "last" for column in last_columns if column in columns}
+    if "value" in columns:
+        aggregations["value"] = "mean"
+    return aggregations
+
+
+def _period_indicators(close_history, freq, ma_periods):
+    """MA ueber ma_periods Periodenschlusskurse und Mayer Multiple darauf, Index = Periode."""
+    period_close = close_history.groupby(close_history.index.to_period(freq)).last()
+    period_ma = period_close.rolling(window=ma_periods, min_periods=ma_periods).mean()
+    return pd.DataFrame({"period_ma": period_ma, "period_mayer_multiple": period_close / period_ma},
+                        dtype="float32")
+
+
+def build_pyramid(df_merged, close_history=None):
+    """
+    Verdichtet df_merged in alle Aufloesungen.
+
+    Args:
+        close_history: taegliche Schlusskurse der ganzen Historie (Series, DatetimeIndex ohne
+            Zeitzone), Grundlage der Zeitrahmen-Indikatoren. Ohne sie wird nur df_merged
+            verwendet.
+
+    Returns:
+    dict Aufloesung ("D", "W", "M") -> DataFrame mit den Chart-Spalten, "W" und "M" plus
+    period_ma und period_mayer_multiple.
+    """
+    aggregations = _aggregations(df_merged.columns)
+    df_daily = df_merged[list(aggregations)]
+    if close_history is None:
+        close_history = df_daily["close"]
+    pyramid = {"D": df_daily}
+    for resolution, freq in _PERIOD_FREQS.items():
+        # Gruppieren nach to_period statt resample: resample erzeugt seine Bins ueber
+        # date_range mit Wochen-/Monats-Offsets in Python, das dominiert sonst die Laufzeit
+        periods = df_daily.index.to_period(freq)
+        df_resampled = df_daily.groupby(periods).agg(aggregations).join(
+            _period_indicators(close_history, freq, TIMEFRAME_CONFIG[resolution]["MA_PERIODS"]), how="left")
+        # Periode mit dem Datum ihres letzten vorhandenen Tages beschriften
+        last_dates = pd.Series(df_daily.index, index=periods).groupby(level=0).last()
+        df_resampled.index = pd.DatetimeIndex(last_dates.reindex(df_resampled.index).to_numpy(),
+                                              name=df_daily.index.name)
+        pyramid[resolution] = df_resampled
+    return pyramid
+
+
+def slice_range(df, start=None, end=None):
+    """Zeilen mit start <= Datum <= end, per binaerer Suche auf dem sortierten Index."""
+    left = 0 if start is None else df.index.searchsorted(pd.Timestamp(start), side="left")
+    right = len(df) if end is None else df.index.searchsorted(pd.Timestamp(end), side="right")
+    return df.iloc[left:right]
+
+
+def select_view(pyramid, start=None, end=None, max_rows=None, resolution=None):
+    """
+    Schneidet den Zeitraum aus der feinsten Aufloesung, die hoechstens max_rows Zeilen hat.
+    Passt keine, wird die groebste genommen. Mit resolution wird genau diese Stufe verwendet
+    (vom Nutzer gewaehlter Zeitrahmen), das Zeilen-Budget gilt dann nicht. Das Punkte-Budget
+    pro Trace ist nicht gemeint, das haelt das Downsampling (LTTB) beim Zeichnen ein.
+    Returns:
+    (Aufloesung, DataFrame-Ausschnitt)
+    """
+    if resolution is not None:
+        return resolution, slice_range(pyramid[resolution], start, end)
+    for resolution in RESOLUTIONS:
+        df_slice = slice_range(pyramid[resolution], start, end)
+        if max_rows is None or len(df_slice) <= max_rows:
+            return resolution, df_slice
+    return resolution, df_slice
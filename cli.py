@@ -0,0 +1,110 @@
+"""
+cli.py - Kommandozeile fuer die 4+4 Signale, ohne Streamlit.
+
+Laedt dieselben Daten wie das Dashboard (lokaler Speicher, inkrementeller Refresh,
+parallele Quellen) und gibt den Status aller 8 Signale als Tabelle oder JSON aus. Gedacht
+fuer Cronjobs und Scheduler, Streamlit wird dabei nicht geladen.
+
+Aufruf:
+    python cli.py signals                 # Tabelle
+    python cli.py signals --json          # JSON auf stdout
+    python cli.py signals --no-onchain    # nur Markt-Signale (ohne CVDD, MVRV-Z)
+    python cli.py assets                  # Mayer Multiple, Q10/Q90 und Signal aller TICKER_SYMBOLS
+
+Exit-Code 1, wenn die Marktdaten nicht geladen werden konnten.
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+import cache
+from data_processing import process_fear_and_greed_data
+from fetch_orchestrator import run_sources
+from helpers import fetch_and_process_data, fetch_dashboard_data, source_output
+from multi_asset import asset_frame, fetch_multi_asset_prices, process_multi_asset_data
+from strategy import calculate_price_levels, get_signal_status, price_levels_payload, signal_status_payload
+
+
+def _print_table(payload):
+    print(f"BTC ${payload['current_price']:,.0f}   Stand {payload['as_of'][:10]}   "
+          f"{payload['months_since_halving']:.1f} Monate seit Halving")
+    for side, title in (("buy", "Kauf"), ("sell", "Verkauf")):
+        print(f"\n{title}")
+        for signal in payload[side].values():
+            state = "AKTIV" if signal['active'] else "-"
+            print(f"  {signal['label']:<20} {state:<6} {signal['gap'] or ''}")
+
+
+def signals(args):
+    if args.no_onchain:
+        data_merged, message, df_merged = fetch_and_process_data()
+        onchain = (None, None, None, None)
+    else:
+        data_merged, message, df_merged, onchain, _ = fetch_dashboard_data()
+    if not data_merged:
+        logging.error("Could not load market data: %s", message)
+        return 1
+
+    payload = signal_status_payload(get_signal_status(df_merged, *onchain), df_merged.index[-1])
+    if args.json:
+        json.dump(payload, sys.stdout, ensure_ascii=False, indent=2 if args.pretty else None)
+        print()
+    else:
+        _print_table(payload)
+    return 0
+
+
+def assets(args):
+    source_results = run_sources({"fear_and_greed": process_fear_and_greed_data,
+                                  "asset_prices": fetch_multi_asset_prices})
+    fear_and_greed_fetched, _, df_fear_and_greed = source_output(source_results, "fear_and_greed")
+    prices_fetched, message, df_closes = source_output(source_results, "asset_prices")
+    df_assets = process_multi_asset_data(df_closes, df_fear_and_greed) if fear_and_greed_fetched and prices_fetched else None
+    if df_assets is None:
+        logging.error("Could not load multi-asset data: %s", message)
+        return 1
+
+    payload = {}
+    for asset in df_assets["close"].columns:
+        df_asset = asset_frame(df_assets, asset)
+        if df_asset.empty:
+            continue
+        payload[asset] = {"as_of": df_asset.index[-1].isoformat(), "signal": str(df_asset["signal"].iloc[-1]),
+                          **price_levels_payload(calculate_price_levels(df_asset))}
+    if args.json:
+        json.dump(payload, sys.stdout, indent=2 if args.pretty else None)
+        print()
+        return 0
+    print(f"{'Asset':<6} {'Stand':<10} {'Preis':>12} {'MM':>6} {'Q10':>6} {'Q90':>6}  Signal")
+    for asset, levels in payload.items():
+        q10, q90 = (f"{levels[key]:.2f}" if levels[key] is not None else "-" for key in ("current_q10", "current_q90"))
+        print(f"{asset:<6} {levels['as_of'][:10]:<10} {levels['current_price']:>12,.2f} "
+              f"{levels['current_mm']:>6.2f} {q10:>6} {q90:>6}  {levels['signal']}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BTC Strategy Dashboard ohne UI")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log-Ausgaben auf stderr")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    signals_parser = subparsers.add_parser("signals", help="Status der 8 Signale")
+    signals_parser.add_argument("--json", action="store_true", help="JSON statt Tabelle")
+    signals_parser.add_argument("--pretty", action="store_true", help="JSON eingerueckt")
+    signals_parser.add_argument("--no-onchain", action="store_true", help="On-Chain Quellen nicht abfragen")
+
+    assets_parser = subparsers.add_parser("assets", help="Mayer Multiple und Signal aller TICKER_SYMBOLS")
+    assets_parser.add_argument("--json", action="store_true", help="JSON statt Tabelle")
+    assets_parser.add_argument("--pretty", action="store_true", help="JSON eingerueckt")
+
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    # Ein Lauf pro Prozess: Cache im Speicher reicht, der lokale Datenspeicher haelt den Rest
+    cache.set_backend("memory")
+    return signals(args) if args.command == "signals" else assets(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,8 @@
 # config.py
 
+import os
+from urllib.parse import urlsplit
+
 # Streamlit page configuration
 PAGE_CONFIG = {
     "page_title": "Strategy Dashboard",
@@ -42,6 +45,17 @@ STRATEGY_CONFIG = {
     "BUY_BLOCK_MONTHS": 18,        # Kaufsignale erst nach 18 Mo. nach Halving
 }
 
+# Parameter-Sweep (sweep.py): Wertebereiche pro STRATEGY_CONFIG-Schluessel.
+# BUY_FG_THRESHOLD None = Kaufsignal ohne F&G-Filter (wie im Dashboard).
+SWEEP_SPACE = {
+    "BUY_MM_QUANTILE": [0.05, 0.10, 0.15, 0.20],
+    "SELL_MM_QUANTILE": [0.80, 0.85, 0.90, 0.95],
+    "Q_MIN_PERIODS": [100, 200, 365],
+    "BUY_FG_THRESHOLD": [None, 25, 35],
+    "SELL_FG_THRESHOLD": [65, 75, 85],
+    "BUY_BLOCK_MONTHS": [12, 18, 24],
+}
+
 # Quick Reference URLs für Sidebar
 QUICK_REFERENCE_URLS = {
     "Halving Progress": "https://charts.bitbo.io/halving-progress/",
@@ -54,9 +68,12 @@ QUICK_REFERENCE_URLS = {
     "Open Interest": "https://www.coinglass.com/OI",
 }
 
-# Ticker symbols
+# Ticker symbols. Dashboard und Signale nutzen "BTC", multi_asset.py alle Eintraege
+# (gebuendelter Download, nur taeglich gehandelte Assets)
 TICKER_SYMBOLS = {
-    "BTC": "BTC-USD"
+    "BTC": "BTC-USD",
+    "ETH": "ETH-USD",
+    "SOL": "SOL-USD",
 }
 
 # Bitcoin Halvings (all halvings until 02.02.2026)
@@ -67,6 +84,104 @@ BITCOIN_HALVINGS = {
     4: {"date": "2024-04-20", "block": 840000, "reward": "3.125 BTC"},
 }
 
+# Lokaler Datenspeicher (Parquet) fuer inkrementelle Aktualisierungen
+# PRICE_REFRESH_BARS: so viele der zuletzt gespeicherten Tageskerzen werden bei jedem
+# Refresh neu geholt und ueberschrieben (die letzte Kerze ist bis Tagesende unfertig).
+STORAGE_CONFIG = {
+    "DIRECTORY": os.environ.get("DASHBOARD_DATA_DIR", ".data"),
+    "PRICE_REFRESH_BARS": 3,
+}
+
+# Paralleles Laden aller Datenquellen (fetch_orchestrator)
+# SOURCE_TIMEOUTS: Deadline pro Quelle in Sekunden, OVERALL_TIMEOUT: Deadline fuer alle
+# zusammen. Quellen, die ihre Deadline verpassen, liefern den Status "timeout".
+FETCH_CONFIG = {
+    "SOURCE_TIMEOUTS": {
+        "fear_and_greed": 20,
+        "btc_prices": 30,
+        "cvdd": 20,
+        "mvrv": 15,
+        "market_cap": 15,
+        "realized_cap": 15,
+    },
+    "OVERALL_TIMEOUT": 35,
+    "MAX_WORKERS": 6,
+}
+
+# Gemeinsame HTTP-Schicht (http_client.py): eine Session mit Keep-Alive-Pool pro Host,
+# Wiederholungen mit exponentiellem Backoff plus Jitter bei Verbindungsfehlern und
+# RETRY_STATUSES, bedingte GETs (ETag/Last-Modified) mit bis zu CACHE_ENTRIES Antworten.
+HTTP_CONFIG = {
+    "TIMEOUT": 20,
+    "POOL_MAXSIZE": 4,
+    "RETRIES": 3,
+    "BACKOFF_FACTOR": 0.5,
+    "BACKOFF_JITTER": 0.5,
+    "RETRY_STATUSES": (500, 502, 503, 504),
+    "CACHE_ENTRIES": 32,
+    "CACHE_MAX_BODY_BYTES": 2_000_000,
+}
+
+# bitcoin-data.com Free Tier (bitcoin_data_client.py): REQUESTS_PER_HOUR wird ueber alle
+# Prozesse und Neustarts hinweg in einem Token-Bucket im lokalen Datenspeicher gezaehlt.
+# Werte juenger als FRESH_FOR Sekunden kommen ohne Anfrage aus dem Speicher, ist das
+# Kontingent aufgebraucht, wird der letzte gute Wert mit seinem Alter geliefert.
+BITCOIN_DATA_CONFIG = {
+    "BASE_URL": "https://bitcoin-data.com/v1",
+    "REQUESTS_PER_HOUR": 10,
+    "FRESH_FOR": 6 * 3600,
+    "TIMEOUT": 10,
+}
+
+# Hintergrund-Refresh (refresh_worker.py)
+# INTERVALS: Aktualisierungsrhythmus pro Quellengruppe in Sekunden. RETRY_DELAY: naechster
+# Versuch, wenn eine Quelle der Gruppe fehlschlaegt. INITIAL_WAIT: so lange wartet eine
+# Seitenanfrage hoechstens auf den allerersten Snapshot nach dem Serverstart.
+REFRESH_CONFIG = {
+    "INTERVALS": {
+        "market": 3600,
+        "onchain": 86400,
+    },
+    "RETRY_DELAY": 300,
+    "INITIAL_WAIT": 60,
+}
+
+# JSON-API (api.py): liefert den Signal-Snapshot des Hintergrund-Workers. MAX_AGE geht als
+# Cache-Control an Clients und Proxies, danach fragen sie mit If-None-Match nach (304).
+API_CONFIG = {
+    "HOST": os.environ.get("DASHBOARD_API_HOST", "127.0.0.1"),
+    "PORT": int(os.environ.get("DASHBOARD_API_PORT", "8502")),
+    "MAX_AGE": 60,
+}
+
+# Chart-Downsampling (downsampling.py): hoechstens so viele Punkte pro Trace werden an
+# den Browser geschickt (LTTB), begrenzt durch PIXEL_WIDTH * POINTS_PER_PIXEL.
+# Erst ueber WEBGL_THRESHOLD Punkten wird Scattergl (WebGL) statt Scatter (SVG) verwendet.
+# Der Wert liegt nicht unter MAX_POINTS_PER_TRACE: mit dem Standard-Budget bleibt jeder
+# Trace bei SVG, WebGL kommt nur zum Zug, wenn das Punkte-Budget erhoeht wird.
+CHART_CONFIG = {
+    "MAX_POINTS_PER_TRACE": 2000,
+    "PIXEL_WIDTH": 1200,
+    "POINTS_PER_PIXEL": 2,
+    "WEBGL_THRESHOLD": 2000,
+    # Zeitrahmen "Auto" (chart_pyramid.select_view): die Tagesdaten bleiben, solange der
+    # Ausschnitt hoechstens so viele Zeilen hat, das Punkte-Budget pro Trace haelt LTTB ein.
+    # Erst darueber wird auf Woche/Monat verdichtet.
+    "AUTO_MAX_ROWS": 50_000,
+}
+
+# Zeitrahmen-Indikatoren (chart_pyramid): gleitender Durchschnitt ueber MA_PERIODS Wochen
+# bzw. Monate und das Mayer Multiple darauf (Schlusskurs der Periode / MA), berechnet aus
+# der ganzen Kurshistorie. Fear & Greed ist in beiden Zeitrahmen der Periodenmittelwert.
+TIMEFRAME_CONFIG = {
+    "W": {"MA_PERIODS": 200, "LABEL": "200-Wochen MA"},
+    "M": {"MA_PERIODS": 12, "LABEL": "12-Monats MA"},
+}
+
+# Lokaler Replay-Server (replay_server.py): ist DASHBOARD_UPSTREAM_URL gesetzt, gehen alle
+# Anfragen an externe Quellen (inkl. yfinance) an diesen Server statt ins Internet.
+UPSTREAM_OVERRIDE_URL = os.environ.get("DASHBOARD_UPSTREAM_URL")
+
 # Days for metrics
 DAYS_FOR_METRICS = 1
 
@@ -75,6 +190,14 @@ def setup_page_config():
     import streamlit as st
     st.set_page_config(**PAGE_CONFIG)
 
+# Function to route an upstream URL through the local replay server (if configured)
+def upstream_url(url):
+    if not UPSTREAM_OVERRIDE_URL:
+        return url
+    parts = urlsplit(url)
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{UPSTREAM_OVERRIDE_URL.rstrip('/')}/{parts.netloc}{parts.path}{query}"
+
 # Function to create the URL to retrieve Fear and Greed data
 def create_fear_and_greed_index_url(days):
-    return f"https://api.alternative.me/fng/?limit={days}"
\ No newline at end of file
+    return upstream_url(f"https://api.alternative.me/fng/?limit={days}")
\ No newline at end of file
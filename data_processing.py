@@ -1,152 +1,394 @@
+import io
 import logging
 import re
+import zlib
+from collections import namedtuple
 import requests
+import numpy as np
 import pandas as pd
-import yfinance as yf
-import streamlit as st
 
-from config import TICKER_SYMBOLS, INDICATORS, TIME_PERIODS, STRATEGY_CONFIG, BITCOIN_HALVINGS, create_fear_and_greed_index_url
+import bitcoin_data_client
+import http_client
+import onchain_history
+from cache import cache_data, cache_resource
+from chart_pyramid import build_pyramid
+from config import (TICKER_SYMBOLS, INDICATORS, TIME_PERIODS, STRATEGY_CONFIG, BITCOIN_HALVINGS, STORAGE_CONFIG,
+                    UPSTREAM_OVERRIDE_URL, create_fear_and_greed_index_url, upstream_url)
+from data_store import load_frame, load_json, save_frame, save_json
+from fetch_orchestrator import run_sources
+from halving import HALVING_INDEX
+from quantiles import update_expanding_quantiles
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
+FEAR_AND_GREED_STORE = "fear_and_greed"
+# Tage, die schon beim vollen Backfill fehlten (Luecken der Quelle selbst)
+FEAR_AND_GREED_GAPS_STORE = "fear_and_greed_gaps"
+
+
+def _fetch_fear_and_greed_days(days):
+    """Holt die letzten `days` Tage des Fear and Greed Index als DataFrame (aufsteigend sortiert)."""
+    url = create_fear_and_greed_index_url(days)
+    logging.info("Fetching Fear and Greed Index data from URL: %s", url)
+    response = http_client.get(url)
+    response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+
+    logging.info("Parsing JSON response for Fear and Greed Index data.")
+    data_json = response.json()
+    df_fear_and_greed = pd.DataFrame(data_json["data"], columns=["value", "value_classification", "timestamp"])
+
+    df_fear_and_greed["timestamp"] = pd.to_datetime(df_fear_and_greed["timestamp"].astype(int), unit="s")
+    df_fear_and_greed.rename(columns={"timestamp": "date"}, inplace=True)
+    return df_fear_and_greed.sort_values("date", ignore_index=True)
+
+
+def _missing_days(dates):
+    """Tage zwischen erstem und letztem Datum, die in `dates` fehlen, als ISO-Strings."""
+    days = pd.DatetimeIndex(dates).normalize()
+    if days.empty:
+        return set()
+    expected = pd.date_range(days.min(), days.max(), freq="D")
+    return {day.strftime("%Y-%m-%d") for day in expected.difference(days)}
+
+
+@cache_data(ttl=3600)  # Cache for 1 hour
 def process_fear_and_greed_data():
     """
     Retrieves and processes the Fear and Greed Index data.
+
+    Die Serie liegt lokal im Parquet-Speicher (data_store). Angefragt werden nur die
+    seit dem letzten gespeicherten Tag fehlenden Tage (plus einen Tag Ueberlappung).
+    Ein voller Backfill ueber TIME_PERIODS["DAYS_PERIODE"] Tage passiert nur, wenn der
+    Speicher leer ist, selbst Luecken hat oder die neuen Daten nicht lueckenlos an ihn
+    anschliessen. Tage, die auch nach dem Backfill fehlen, fehlen in der Quelle; sie werden
+    gemerkt (FEAR_AND_GREED_GAPS_STORE) und loesen keinen weiteren Backfill aus.
     Returns:
     Tuple: A tuple containing a boolean, a message, and a DataFrame.
     """
-    url = create_fear_and_greed_index_url(TIME_PERIODS.get("DAYS_PERIODE"))
+    df_stored = load_frame(FEAR_AND_GREED_STORE)
+    full_days = TIME_PERIODS.get("DAYS_PERIODE")
     try:
-        logging.info("Fetching Fear and Greed Index data from URL: %s", url)
-        response = requests.get(url)
-        response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
-
-        logging.info("Parsing JSON response for Fear and Greed Index data.")
-        data_json = response.json()
-        df_fear_and_greed = pd.DataFrame(data_json["data"])
-
-        df_fear_and_greed["timestamp"] = pd.to_datetime(df_fear_and_greed["timestamp"].astype(int), unit="s")
-        df_fear_and_greed.rename(columns={"timestamp": "date"}, inplace=True)
-
+        df_fear_and_greed = None
+        if df_stored is not None and not df_stored.empty:
+            today = pd.Timestamp.now(tz="UTC").tz_localize(None).normalize()
+            last_date = df_stored["date"].max()
+            missing_days = (today - last_date).days
+            # Luecken zuerst pruefen, sonst wird ein aktueller Speicher erst am naechsten Tag repariert
+            unexpected_gaps = _missing_days(df_stored["date"]) - set(load_json(FEAR_AND_GREED_GAPS_STORE) or [])
+            if unexpected_gaps:
+                logging.warning("Fear and Greed store has %d missing days, running full backfill.",
+                                len(unexpected_gaps))
+            elif missing_days <= 0:
+                logging.info("Fear and Greed Index data is up to date in local store.")
+                return True, "Fear and greed data successfully fetched!", df_stored
+            elif missing_days < full_days:
+                df_delta = _fetch_fear_and_greed_days(missing_days + 1)
+                if not df_delta.empty and df_delta["date"].min() <= last_date + pd.Timedelta(days=1):
+                    df_fear_and_greed = pd.concat([df_stored[df_stored["date"] < df_delta["date"].min()], df_delta],
+                                                  ignore_index=True)
+                else:
+                    logging.warning("Fear and Greed delta does not connect to local store, running full backfill.")
+
+        if df_fear_and_greed is None:
+            df_fear_and_greed = _fetch_fear_and_greed_days(full_days)
+            save_json(FEAR_AND_GREED_GAPS_STORE, sorted(_missing_days(df_fear_and_greed["date"])))
+
+        save_frame(FEAR_AND_GREED_STORE, df_fear_and_greed)
         logging.info("Fear and Greed Index data successfully processed.")
         return True, "Fear and greed data successfully fetched!", df_fear_and_greed
 
     except requests.RequestException as e:
+        if df_stored is not None and not df_stored.empty:
+            logging.warning("Failed to refresh Fear and Greed data, using local store: %s", e)
+            return True, "Fear and greed data loaded from local store (refresh failed)", df_stored
         logging.exception("Failed to fetch Fear and Greed data: %s", e)
         return False, "Error fetching fear and greed data!", None
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
+def _merge_price_history(df_stored, df_fetched):
+    """
+    Haengt frisch geholte Tageskerzen an die gespeicherte Historie an.
+    Ueberlappende Tage werden durch die neuen Werte ersetzt, so werden die letzten,
+    beim letzten Refresh noch unfertigen Kerzen korrigiert.
+    """
+    if df_stored is None or df_stored.empty:
+        return df_fetched
+    if df_fetched is None or df_fetched.empty:
+        return df_stored
+    df_combined = pd.concat([df_stored[df_stored.index < df_fetched.index.min()], df_fetched])
+    return df_combined[~df_combined.index.duplicated(keep="last")].sort_index()
+
+
+def _download_price_history(ticker_symbol, **history_kwargs):
+    """
+    Kursdaten wie yfinance.Ticker.history(**history_kwargs). Im Replay-Modus
+    (DASHBOARD_UPSTREAM_URL gesetzt) kommen sie als CSV vom lokalen Replay-Server.
+    """
+    if UPSTREAM_OVERRIDE_URL:
+        response = http_client.get(upstream_url(f"https://yfinance/{ticker_symbol}/history"),
+                                   params=history_kwargs, timeout=30)
+        response.raise_for_status()
+        df_history = pd.read_csv(io.StringIO(response.text), index_col="Date")
+        df_history.index = pd.to_datetime(df_history.index, utc=True).rename("Date")
+        return df_history
+    import yfinance as yf  # erst beim ersten Kursabruf laden, kostet beim Start ~0.5s
+    return yf.Ticker(ticker_symbol).history(**history_kwargs)
+
+
+@cache_data(ttl=3600)  # Cache for 1 hour
 def process_historical_data():
     """
     Retrieves historical Bitcoin price data.
+
+    Die Historie liegt lokal im Parquet-Speicher (data_store). Bei einem Refresh werden
+    nur die Tage ab den letzten STORAGE_CONFIG["PRICE_REFRESH_BARS"] gespeicherten
+    Kerzen geholt, angehaengt und die letzten Kerzen korrigiert. Nur wenn der Speicher
+    leer oder unbrauchbar ist, wird die komplette Historie geladen.
     Returns:
     Tuple: A tuple containing a boolean, a message, and a DataFrame.
     """
-    try:
-        tickerSymbol = TICKER_SYMBOLS.get("BTC")
-        logging.info("Fetching historical BTC price data for ticker symbol: %s", tickerSymbol)
-
-        tickerData = yf.Ticker(tickerSymbol)
-
-        # Use 'max' period to get all available data instead of specifying days
-        # yfinance doesn't support very long periods like 2000d
-        df_historical_btc = tickerData.history(period="max")
+    tickerSymbol = TICKER_SYMBOLS.get("BTC")
+    store_name = f"price_history_{tickerSymbol}"
+    df_stored = load_frame(store_name)
 
-        if df_historical_btc.empty:
+    try:
+        # Eigenes Flag statt df_stored = None: der Speicher bleibt Rueckfall, falls auch
+        # der volle Download scheitert
+        full_reload = df_stored is None or df_stored.empty
+        if not full_reload:
+            refresh_bars = min(STORAGE_CONFIG["PRICE_REFRESH_BARS"], len(df_stored))
+            start_date = df_stored.index[-refresh_bars]
+            logging.info("Fetching BTC price data for %s since %s (incremental).", tickerSymbol, start_date.date())
+            df_fetched = _download_price_history(tickerSymbol, start=start_date.strftime("%Y-%m-%d"))
+            try:
+                df_historical_btc = _merge_price_history(df_stored, df_fetched)
+            except Exception as e:
+                # z.B. geaenderte Zeitzone oder Spalten bei yfinance: Speicher neu aufbauen
+                logging.warning("Stored BTC price history is incompatible, reloading it: %s", e)
+                full_reload = True
+
+        if full_reload:
+            logging.info("Fetching full historical BTC price data for ticker symbol: %s", tickerSymbol)
+            # Use 'max' period to get all available data instead of specifying days
+            # yfinance doesn't support very long periods like 2000d
+            df_historical_btc = _download_price_history(tickerSymbol, period="max")
+
+        if df_historical_btc is None or df_historical_btc.empty:
             logging.error("No historical BTC price data retrieved.")
             return False, "No historical BTC price data available!", None
 
+        save_frame(store_name, df_historical_btc)
         logging.info("Historical BTC price data successfully fetched.")
         return True, "Historical BTC prices successfully fetched!", df_historical_btc
 
     except Exception as e:
+        if df_stored is not None and not df_stored.empty:
+            logging.warning("Failed to refresh BTC price data, using local store: %s", e)
+            return True, "Historical BTC prices loaded from local store (refresh failed)", df_stored
         logging.exception("Failed to fetch historical BTC price data: %s", e)
         return False, f"Error fetching historical data: {e}", None
 
+# Signal-Codes der vektorisierten Signal-Berechnung, SIGNAL_LABELS[code] ergibt den Text
+SIGNAL_HOLD, SIGNAL_BUY, SIGNAL_SELL = 0, 1, 2
+SIGNAL_LABELS = np.array(["hold", "buy", "sell"], dtype=object)
+
+
+def compute_signal_codes(dates, mayer_multiple, q10, q90, fear_and_greed, sell_fg_threshold, buy_block_months,
+                         buy_fg_threshold=None):
+    """
+    Vektorisierte 4+4 Signal-Logik ueber NumPy-Arrays, liefert int8 Signal-Codes.
+
+    - Kauf:    MM < Q10, ausser das Datum liegt 0 bis buy_block_months Monate nach
+               einem Halving (Bull-Phase), dann hold. Vor dem ersten Halving erlaubt.
+    - Verkauf: MM > Q90 und F&G >= sell_fg_threshold (nur wenn keine Kaufbedingung).
+    Mit buy_fg_threshold wird Kaufen zusaetzlich an F&G < buy_fg_threshold gebunden
+    (nur fuer Parameter-Sweeps, das Dashboard nutzt None = kein F&G-Filter).
+    NaN in Q10/Q90/F&G erfuellt keine Bedingung. Das letzte Halving pro Datum kommt per
+    searchsorted aus dem HALVING_INDEX statt aus einer Schleife pro Zeile.
+    Fuer mehrere Assets (multi_asset) sind mayer_multiple, q10 und q90 2D (Zeile = Datum,
+    Spalte = Asset), fear_and_greed als (n, 1) wird dann auf alle Spalten angewendet.
+    """
+    in_buy_block = HALVING_INDEX.in_buy_block_window_array(dates, buy_block_months)
+    if np.ndim(mayer_multiple) == 2:
+        in_buy_block = in_buy_block[:, np.newaxis]
+
+    buy_condition = mayer_multiple < q10
+    if buy_fg_threshold is not None:
+        buy_condition &= fear_and_greed < buy_fg_threshold
+    sell_condition = ~buy_condition & (mayer_multiple > q90) & (fear_and_greed >= sell_fg_threshold)
+
+    codes = np.full(np.shape(mayer_multiple), SIGNAL_HOLD, dtype=np.int8)
+    codes[sell_condition] = SIGNAL_SELL
+    codes[buy_condition & ~in_buy_block] = SIGNAL_BUY
+    return codes
+
+
+def frame_fingerprint(df):
+    """
+    Billiger Fingerabdruck eines DataFrames: (Zeilenzahl, letztes Datum, CRC32 ueber
+    die Zeilen-Hashes). Aendert sich ein einzelner Wert, aendert sich der Fingerabdruck.
+    """
+    if df is None:
+        return None
+    if len(df) == 0:
+        return (0, None, 0)
+    last_date = df["date"].iloc[-1] if "date" in df.columns else df.index[-1]
+    checksum = zlib.crc32(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return (len(df), str(last_date), checksum)
+
+
+def _merge_params(lower_mm_quantil, upper_mm_quantil, lower_fear_and_greed, upper_fear_and_greed, bigger_sma, smaller_sma):
+    """Alle Parameter, von denen df_merged abhaengt (Argumente plus STRATEGY_CONFIG und Halvings)."""
+    return (
+        (lower_mm_quantil, upper_mm_quantil, lower_fear_and_greed, upper_fear_and_greed, bigger_sma, smaller_sma),
+        tuple(sorted(STRATEGY_CONFIG.items())),
+        tuple((num, data["date"]) for num, data in sorted(BITCOIN_HALVINGS.items())),
+    )
+
+
+# Ergebnis des gecachten Merges: df_merged plus Tages-/Wochen-/Monatsstufen (chart_pyramid).
+# Die Stufen liegen bewusst nicht in df_merged.attrs, pandas kopiert attrs tief bei jeder Operation.
+MergedData = namedtuple("MergedData", ["df_merged", "timeframes"])
+
+
+def _daily_close_history(df_historical_btc):
+    """Schlusskurse der ganzen Historie mit Tagesindex ohne Zeitzone (wie date in df_merged)."""
+    close_history = df_historical_btc["Close"]
+    index = close_history.index
+    return close_history.set_axis(index.tz_localize(None) if index.tz is not None else index)
+
+
+# cache_resource statt cache_data: der Frame wird ohne Kopie an alle Sessions
+# ausgeliefert (Mikrosekunden statt Unpickling pro Rerun). Aufrufer duerfen df_merged
+# und die Zeitrahmen deshalb nur lesen, nie in-place veraendern.
+@cache_resource(ttl=3600, max_entries=8, show_spinner=False)
+def _process_and_merge_cached(_df_historical_btc, _df_fear_and_greed, fingerprint, params):
+    df_merged = _process_and_merge_data(_df_historical_btc, _df_fear_and_greed, *params[0])
+    if df_merged is None:
+        return None
+    df_merged.attrs["data_version"] = f"{zlib.crc32(repr((fingerprint, params)).encode()):08x}"
+    try:
+        timeframes = build_pyramid(df_merged, _daily_close_history(_df_historical_btc))
+    except Exception as e:
+        logging.exception("Failed to build weekly and monthly timeframes: %s", e)
+        timeframes = build_pyramid(df_merged)
+    return MergedData(df_merged, timeframes)
+
+
+def process_and_merge_timeframes(df_historical_btc, df_fear_and_greed, lower_mm_quantil, upper_mm_quantil, lower_fear_and_greed, upper_fear_and_greed, bigger_sma, smaller_sma):
+    """
+    Wie process_and_merge_data, zusaetzlich die Zeitrahmen aus demselben gecachten Durchgang.
+    Returns:
+    MergedData (df_merged, timeframes: dict "D"/"W"/"M" -> DataFrame, siehe
+    chart_pyramid.build_pyramid) oder None.
+    """
+    fingerprint = (frame_fingerprint(df_historical_btc), frame_fingerprint(df_fear_and_greed))
+    params = _merge_params(lower_mm_quantil, upper_mm_quantil, lower_fear_and_greed, upper_fear_and_greed,
+                           bigger_sma, smaller_sma)
+    return _process_and_merge_cached(df_historical_btc, df_fear_and_greed, fingerprint, params)
+
+
 def process_and_merge_data(df_historical_btc, df_fear_and_greed, lower_mm_quantil, upper_mm_quantil, lower_fear_and_greed, upper_fear_and_greed, bigger_sma, smaller_sma):
     """
     Processes and merges two dataframes: historical Bitcoin prices and Fear and Greed Index data.
+
+    Memoisiert auf dem Fingerabdruck beider Eingangs-Frames plus allen Parametern, ein
+    Streamlit-Rerun ohne neue Daten rechnet nichts neu. Die Version der Daten steht in
+    df_merged.attrs["data_version"].
     Returns:
     DataFrame: A merged and processed DataFrame with added indicators and trading signals.
     """
-    try:
-        logging.info("Processing and merging historical BTC and Fear and Greed data.")
+    merged = process_and_merge_timeframes(df_historical_btc, df_fear_and_greed, lower_mm_quantil, upper_mm_quantil,
+                                          lower_fear_and_greed, upper_fear_and_greed, bigger_sma, smaller_sma)
+    return merged.df_merged if merged is not None else None
 
-        df_historical_btc = df_historical_btc.reset_index()
-        df_historical_btc.columns = [c.lower() for c in df_historical_btc.columns]
-        df_historical_btc["date"] = df_historical_btc["date"].dt.tz_localize(None)
-        df_historical_btc = df_historical_btc.drop(["dividends", "stock splits"], axis=1)
 
-        df_historical_btc[f"{bigger_sma}_day_ma"] = df_historical_btc["close"].rolling(window=bigger_sma).mean()
-        df_historical_btc[f"{smaller_sma}_day_ma"] = df_historical_btc["close"].rolling(window=smaller_sma).mean()
-        df_historical_btc["200_days_sma_for_mm"] = df_historical_btc["close"].rolling(window=200).mean()
-        df_historical_btc["mayer_multiple"] = df_historical_btc["close"] / df_historical_btc["200_days_sma_for_mm"]
+def _merge_base_frames(df_historical_btc, df_fear_and_greed, bigger_sma, smaller_sma):
+    """
+    Erster Schritt von process_and_merge_data: SMAs und Mayer Multiple auf der BTC-Historie,
+    danach Inner-Merge mit dem Fear and Greed Index. Noch ohne Quantile und Signale.
+    Returns:
+    Tuple (df_historical_btc mit Indikatoren, df_merged).
+    """
+    df_historical_btc = df_historical_btc.reset_index()
+    df_historical_btc.columns = [c.lower() for c in df_historical_btc.columns]
+    df_historical_btc["date"] = df_historical_btc["date"].dt.tz_localize(None)
+    df_historical_btc = df_historical_btc.drop(["dividends", "stock splits"], axis=1)
+
+    df_historical_btc[f"{bigger_sma}_day_ma"] = df_historical_btc["close"].rolling(window=bigger_sma).mean()
+    df_historical_btc[f"{smaller_sma}_day_ma"] = df_historical_btc["close"].rolling(window=smaller_sma).mean()
+    df_historical_btc["200_days_sma_for_mm"] = df_historical_btc["close"].rolling(window=200).mean()
+    df_historical_btc["mayer_multiple"] = df_historical_btc["close"] / df_historical_btc["200_days_sma_for_mm"]
 
-        df_historical_btc.dropna(subset=["200_days_sma_for_mm"], inplace=True)
-        df_fear_and_greed = df_fear_and_greed.drop(["time_until_update"], axis=1)
-        df_fear_and_greed["value"] = pd.to_numeric(df_fear_and_greed["value"], errors="coerce")
+    df_historical_btc.dropna(subset=["200_days_sma_for_mm"], inplace=True)
+    df_fear_and_greed = df_fear_and_greed.drop(["time_until_update"], axis=1, errors="ignore")
+    df_fear_and_greed["value"] = pd.to_numeric(df_fear_and_greed["value"], errors="coerce")
 
-        df_merged = pd.merge(df_historical_btc, df_fear_and_greed, left_on="date", right_on="date", how="inner")
-        lower_quantile = df_historical_btc["mayer_multiple"].quantile(lower_mm_quantil)
-        upper_quantile = df_historical_btc["mayer_multiple"].quantile(upper_mm_quantil)
+    df_merged = pd.merge(df_historical_btc, df_fear_and_greed, left_on="date", right_on="date", how="inner")
+    return df_historical_btc, df_merged
 
-        df_merged[f"{lower_mm_quantil}_quantile"] = lower_quantile
-        df_merged[f"{upper_mm_quantil}_quantile"] = upper_quantile
 
-        # Q90 expanding (Verkaufssignal: rollierendes 90%-Quantil)
-        df_merged['q90_expanding'] = df_merged['mayer_multiple'].expanding(
-            min_periods=STRATEGY_CONFIG['Q_MIN_PERIODS']
-        ).quantile(0.9)
+def _compact_merged_frame(df_merged, bigger_sma, smaller_sma):
+    """
+    Projiziert df_merged auf die Spalten, die Strategie und Charts brauchen.
+    Open/High/Low/Volume und value_classification fallen weg, ebenso die SMA-Spalte, die
+    bei 200 Tagen nur 200_days_sma_for_mm dupliziert. Alles, was in Signale und Zielpreise
+    eingeht, bleibt float64 (identische Vergleiche wie bisher). Reine Chart-Spalten und
+    der ganzzahlige Fear & Greed Index werden float32, das Signal ist kategorial (int8-Codes).
+    """
+    columns = {"close": "float64", "200_days_sma_for_mm": "float64"}
+    for sma in (bigger_sma, smaller_sma):
+        if sma != 200:
+            columns[f"{sma}_day_ma"] = "float32"
+    columns.update({
+        "mayer_multiple": "float64",
+        "value": "float32",
+        "q90_expanding": "float64",
+        "q10_expanding": "float64",
+        "q90_price_level": "float32",
+        "q10_price_level": "float32",
+        "signal": "category",
+    })
+    return df_merged[list(columns)].astype(columns)
+
+
+def _process_and_merge_data(df_historical_btc, df_fear_and_greed, lower_mm_quantil, upper_mm_quantil, lower_fear_and_greed, upper_fear_and_greed, bigger_sma, smaller_sma):
+    """Ungecachte Berechnung von df_merged, siehe process_and_merge_data."""
+    try:
+        logging.info("Processing and merging historical BTC and Fear and Greed data.")
 
-        # Q10 expanding (Kaufsignal: rollierendes 10%-Quantil)
-        df_merged['q10_expanding'] = df_merged['mayer_multiple'].expanding(
-            min_periods=STRATEGY_CONFIG['Q_MIN_PERIODS']
-        ).quantile(0.1)
+        df_historical_btc, df_merged = _merge_base_frames(df_historical_btc, df_fear_and_greed, bigger_sma, smaller_sma)
+        # Statische Quantile ueber die ganze Historie: eine Zahl pro Quantil, als Metadaten statt Spalte
+        mm_quantiles = {
+            lower_mm_quantil: float(df_historical_btc["mayer_multiple"].quantile(lower_mm_quantil)),
+            upper_mm_quantil: float(df_historical_btc["mayer_multiple"].quantile(upper_mm_quantil)),
+        }
+
+        # Q90 expanding (Verkaufssignal) und Q10 expanding (Kaufsignal) in einem Durchgang,
+        # inkrementell gegenueber dem letzten Stand (quantiles.update_expanding_quantiles)
+        sell_quantile = STRATEGY_CONFIG['SELL_MM_QUANTILE']
+        buy_quantile = STRATEGY_CONFIG['BUY_MM_QUANTILE']
+        df_quantiles = update_expanding_quantiles(
+            df_merged["date"].to_numpy(), df_merged["mayer_multiple"].to_numpy(dtype=float),
+            (sell_quantile, buy_quantile), STRATEGY_CONFIG['Q_MIN_PERIODS'], "mm_expanding_quantiles"
+        )
+        df_merged['q90_expanding'] = df_quantiles.iloc[:, 0].to_numpy()
+        df_merged['q10_expanding'] = df_quantiles.iloc[:, 1].to_numpy()
 
         # Preislevels für Chart-Visualisierung
         df_merged['q90_price_level'] = df_merged['200_days_sma_for_mm'] * df_merged['q90_expanding']
         df_merged['q10_price_level'] = df_merged['200_days_sma_for_mm'] * df_merged['q10_expanding']
 
-        def months_since_halving_for_date(check_date):
-            """Berechnet Monate seit letztem Halving für ein bestimmtes Datum"""
-            check_date = pd.Timestamp(check_date)
-            last_halving = None
-            for halving_data in BITCOIN_HALVINGS.values():
-                halving_date = pd.Timestamp(halving_data["date"])
-                if halving_date <= check_date:
-                    if last_halving is None or halving_date > last_halving:
-                        last_halving = halving_date
-            if last_halving is None:
-                return None
-            return (check_date - last_halving).days / 30.44
-
-        def is_in_buy_block_window(check_date):
-            """Prüft ob Datum in Bull-Phase (0-18 Mo. nach Halving) liegt"""
-            months = months_since_halving_for_date(check_date)
-            if months is None:
-                return False  # Vor erstem Halving - erlauben
-            buy_block_months = STRATEGY_CONFIG.get('BUY_BLOCK_MONTHS', 18)
-            return months < buy_block_months
-
-        def determine_signal(row):
-            # 4+4 Strategie: Kauf wenn MM < Q10, Verkauf wenn MM > Q90 und FG > Schwelle
-            q10 = row.get("q10_expanding")
-            q90 = row.get("q90_expanding")
-            if pd.notna(q10) and row["mayer_multiple"] < q10:
-                if is_in_buy_block_window(row["date"]):
-                    return "hold"
-                return "buy"
-            elif (pd.notna(q90) and
-                  row["mayer_multiple"] > q90 and
-                  row["value"] >= STRATEGY_CONFIG['SELL_FG_THRESHOLD']):
-                return "sell"
-            else:
-                return "hold"
-
-        df_merged["signal"] = df_merged.apply(determine_signal, axis=1)
-        df_merged.set_index("date", inplace=True)
+        # 4+4 Strategie: Kauf wenn MM < Q10, Verkauf wenn MM > Q90 und FG > Schwelle
+        signal_codes = compute_signal_codes(
+            df_merged["date"].to_numpy(), df_merged["mayer_multiple"].to_numpy(dtype=float),
+            df_merged["q10_expanding"].to_numpy(dtype=float), df_merged["q90_expanding"].to_numpy(dtype=float),
+            df_merged["value"].to_numpy(dtype=float),
+            STRATEGY_CONFIG['SELL_FG_THRESHOLD'], STRATEGY_CONFIG.get('BUY_BLOCK_MONTHS', 18)
+        )
+        df_merged["signal"] = pd.Categorical.from_codes(signal_codes, categories=SIGNAL_LABELS)
+        df_merged = _compact_merged_frame(df_merged.set_index("date"), bigger_sma, smaller_sma)
+        df_merged.attrs["mm_quantiles"] = mm_quantiles
 
         logging.info("Data merged and processed successfully.")
         return df_merged
@@ -155,6 +397,29 @@ def process_and_merge_data(df_historical_btc, df_fear_and_greed, lower_mm_quanti
         logging.exception("Failed to process and merge data: %s", e)
         return None
 
+def trade_indices(signal_codes, close):
+    """
+    Zustandsautomat ueber Signal-Codes und Schlusskursen, liefert die Zeilen-Indizes der Trades.
+
+    Start ohne Position: ein Kaufsignal eroeffnet eine Position, ein Verkaufssignal
+    schliesst sie, aber nur wenn der Kurs ueber dem Kaufpreis liegt (Verkauf nur im Plus).
+    Durchlaufen werden nur die Zeilen mit Kauf- oder Verkaufssignal.
+    """
+    candidates = np.flatnonzero(signal_codes != SIGNAL_HOLD)
+    indices = []
+    buy_price = None
+    for i in candidates:
+        if buy_price is None:
+            if signal_codes[i] == SIGNAL_BUY:
+                buy_price = close[i]  # Kaufpreis merken
+                indices.append(i)
+        elif signal_codes[i] == SIGNAL_SELL and close[i] > buy_price:
+            # P&L Check: Nur verkaufen wenn Position im Plus, sonst Signal ignorieren
+            buy_price = None
+            indices.append(i)
+    return np.array(indices, dtype=np.intp)
+
+
 def calculate_sell_and_buy_history(df_merged, signal_column="signal"):
     """
     Filters and processes the merged DataFrame to create a history of buy and sell trades.
@@ -171,30 +436,16 @@ def calculate_sell_and_buy_history(df_merged, signal_column="signal"):
     """
     try:
         logging.info(f"Calculating buy and sell history using {signal_column}.")
-        filtered_df = df_merged[df_merged[signal_column].isin(["buy", "sell"])].copy()
-        status = "sell"
-        buy_price = None
-        rows_to_add = []
-
-        for index, row in filtered_df.iterrows():
-            if status == "sell" and row[signal_column] == "buy":
-                status = "buy"
-                buy_price = row["close"]  # Kaufpreis merken
-                row_copy = row.copy()
-                row_copy['signal'] = row[signal_column]  # Normalize to 'signal'
-                rows_to_add.append(row_copy)
-            elif status == "buy" and row[signal_column] == "sell":
-                # P&L Check: Nur verkaufen wenn Position im Plus!
-                current_price = row["close"]
-                if buy_price is not None and current_price > buy_price:
-                    status = "sell"
-                    buy_price = None  # Reset
-                    row_copy = row.copy()
-                    row_copy['signal'] = row[signal_column]
-                    rows_to_add.append(row_copy)
-                # Else: Verkaufssignal ignorieren, warte auf profitablen Verkauf
-
-        sell_and_buy_history = pd.DataFrame(rows_to_add)
+        signals = df_merged[signal_column]
+        if isinstance(signals.dtype, pd.CategoricalDtype) and list(signals.cat.categories) == list(SIGNAL_LABELS):
+            signal_codes = signals.cat.codes.to_numpy()
+        else:
+            signals = signals.to_numpy()
+            signal_codes = np.select([signals == "buy", signals == "sell"], [SIGNAL_BUY, SIGNAL_SELL], SIGNAL_HOLD)
+        indices = trade_indices(signal_codes, df_merged["close"].to_numpy(dtype=float))
+
+        sell_and_buy_history = df_merged.iloc[indices].copy()
+        sell_and_buy_history['signal'] = sell_and_buy_history[signal_column]  # Normalize to 'signal'
 
         if sell_and_buy_history.empty:
             logging.info("No trades were triggered with the given parameters.")
@@ -214,6 +465,7 @@ def calculate_sell_and_buy_history(df_merged, signal_column="signal"):
         logging.exception("Failed to calculate buy and sell history: %s", e)
         return False, "Error calculating buy and sell history", None
 
+@cache_data(ttl=86400)  # 24h Cache, wie die uebrigen On-Chain Quellen
 def fetch_cvdd_from_axeladlerjr():
     """
     Fetches CVDD from axeladlerjr.com (statisch im HTML, kein JavaScript noetig).
@@ -233,12 +485,14 @@ def fetch_cvdd_from_axeladlerjr():
     """
     try:
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        resp = requests.get('https://axeladlerjr.com/charts/bitcoin-cvdd/', headers=headers, timeout=15)
+        resp = http_client.get(upstream_url('https://axeladlerjr.com/charts/bitcoin-cvdd/'), headers=headers, timeout=15)
         resp.raise_for_status()
         plain_text = re.sub(r'<[^>]+>', '', resp.text)
         match = re.search(r'CVDD is\s*\$?([\d,]+)', plain_text)
         if match:
-            return float(match.group(1).replace(',', ''))
+            cvdd_current = float(match.group(1).replace(',', ''))
+            onchain_history.record("cvdd", cvdd_current)
+            return cvdd_current
         logging.warning("CVDD-Muster auf axeladlerjr.com nicht gefunden, Seite hat sich moeglicherweise geaendert.")
         return None
     except Exception as e:
@@ -246,7 +500,71 @@ def fetch_cvdd_from_axeladlerjr():
         return None
 
 
-@st.cache_data(ttl=86400)  # 24h Cache, Daten aktualisieren sich ohnehin nur 1x/Tag
+def _fetch_bitcoin_data_last(path):
+    """Letzter Wert einer Metrik von bitcoin-data.com ueber den Client mit Anfragekontingent,
+    float oder None, wenn weder live noch im Ledger ein Wert vorliegt. Neu abgerufene Werte
+    werden in der On-Chain Historie (onchain_history) fortgeschrieben, Werte aus dem Ledger
+    stehen dort schon."""
+    entry = bitcoin_data_client.fetch_last_entry(path, bitcoin_data_client.METRICS[path][0])
+    if entry is None:
+        return None
+    if not entry["cached"]:
+        # Tag des Werts laut API ("d"), wie beim Backfill; nur ohne ihn der Abruftag
+        date = entry.get("date") or pd.Timestamp(entry["fetched_at"], unit="s")
+        onchain_history.record(onchain_history.column_for_path(path), entry["value"], date)
+    return entry["value"]
+
+
+@cache_data(ttl=86400)  # 24h Cache, Daten aktualisieren sich ohnehin nur 1x/Tag
+def fetch_mvrv_zscore():
+    """Aktueller MVRV-Z-Score von bitcoin-data.com, float oder None bei Fehler."""
+    return _fetch_bitcoin_data_last("mvrv-zscore")
+
+
+@cache_data(ttl=86400)
+def fetch_market_cap():
+    """Aktuelle Marktkapitalisierung in USD von bitcoin-data.com, float oder None bei Fehler."""
+    return _fetch_bitcoin_data_last("market-cap")
+
+
+@cache_data(ttl=86400)
+def fetch_realized_cap():
+    """Aktuelle realisierte Kapitalisierung in USD von bitcoin-data.com, float oder None bei Fehler."""
+    return _fetch_bitcoin_data_last("realized-cap")
+
+
+@cache_data(ttl=3600, show_spinner=False)
+def load_onchain_history():
+    """Gespeicherte On-Chain Historie (siehe onchain_history), DataFrame oder None."""
+    return onchain_history.load_history()
+
+
+def stale_bitcoin_data_values():
+    """Werte von bitcoin-data.com, die beim letzten Refresh nicht aktualisiert werden konnten
+    (Kontingent aufgebraucht, 429 oder Anfrage fehlgeschlagen) und aus dem Ledger kamen.
+    Einmal pro Refresh gelesen (refresh_worker). Returns: dict Anzeigename -> Abrufzeitpunkt (Unix-Zeit)."""
+    return {bitcoin_data_client.METRICS[path][1]: entry["fetched_at"]
+            for path, entry in bitcoin_data_client.fallback_entries().items()}
+
+
+# Reihenfolge entspricht dem Rueckgabe-Tuple von fetch_onchain_data
+ONCHAIN_SOURCES = {
+    "cvdd": fetch_cvdd_from_axeladlerjr,
+    "mvrv": fetch_mvrv_zscore,
+    "market_cap": fetch_market_cap,
+    "realized_cap": fetch_realized_cap,
+}
+
+
+def onchain_values(source_results):
+    """Baut aus den Ergebnissen von fetch_orchestrator.run_sources das On-Chain Tuple,
+    fehlgeschlagene oder zu langsame Quellen werden zu None."""
+    return tuple(
+        source_results[name]["value"] if name in source_results and source_results[name]["status"] == "ok" else None
+        for name in ONCHAIN_SOURCES
+    )
+
+
 def fetch_onchain_data():
     """
     Fetches current on-chain data: CVDD (axeladlerjr.com, siehe Warnhinweis in
@@ -258,43 +576,12 @@ def fetch_onchain_data():
     strategy.py daraus den Zielpreis fuer das MVRV-Z Verkaufssignal herleiten kann
     (wie weit muesste der Preis steigen, damit MVRV-Z >= 5 wird).
 
+    Die vier Quellen laufen parallel (fetch_orchestrator) und sind einzeln 24h gecacht.
+
     Returns: (cvdd_current, mvrv_current, market_cap_current, realized_cap_current),
     jeweils float oder None bei Fehler.
     """
-    cvdd_current = fetch_cvdd_from_axeladlerjr()
-    mvrv_current = None
-    market_cap_current = None
-    realized_cap_current = None
-
-    try:
-        mvrv_resp = requests.get("https://bitcoin-data.com/v1/mvrv-zscore/last", timeout=10)
-        mvrv_resp.raise_for_status()
-        mvrv_current = mvrv_resp.json().get('mvrvZscore')
-    except Exception as e:
-        logging.warning("Failed to fetch MVRV-Z data: %s", e)
-
-    try:
-        mc_resp = requests.get("https://bitcoin-data.com/v1/market-cap/last", timeout=10)
-        mc_resp.raise_for_status()
-        market_cap_current = mc_resp.json().get('marketCap')
-    except Exception as e:
-        logging.warning("Failed to fetch market cap data: %s", e)
-
-    try:
-        rc_resp = requests.get("https://bitcoin-data.com/v1/realized-cap/last", timeout=10)
-        rc_resp.raise_for_status()
-        realized_cap_current = rc_resp.json().get('realizedCap')
-    except Exception as e:
-        logging.warning("Failed to fetch realized cap data: %s", e)
-
-    if mvrv_current is not None:
-        mvrv_current = float(mvrv_current)
-    if market_cap_current is not None:
-        market_cap_current = float(market_cap_current)
-    if realized_cap_current is not None:
-        realized_cap_current = float(realized_cap_current)
-
-    return cvdd_current, mvrv_current, market_cap_current, realized_cap_current
+    return onchain_values(run_sources(ONCHAIN_SOURCES))
 
 
 def classify_fear_and_greed(value):
@@ -0,0 +1,119 @@
+"""
+data_store.py - Lokaler Spaltenspeicher (Parquet) fuer Zeitreihen.
+
+Die Fetcher in data_processing legen ihre Historie hier ab, damit ein Refresh nur
+noch die fehlenden Tage holen muss statt der kompletten Historie. Geschrieben wird
+atomar (temporaere Datei + os.replace), damit parallele Prozesse nie eine halb
+geschriebene Datei lesen.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pandas as pd
+
+from config import STORAGE_CONFIG
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def store_path(name, suffix="parquet"):
+    """Pfad der Speicherdatei fuer einen Datensatz."""
+    return os.path.join(STORAGE_CONFIG["DIRECTORY"], f"{name}.{suffix}")
+
+
+@contextmanager
+def locked(name):
+    """
+    Exklusiver, prozessuebergreifender Lock fuer einen Datensatz (Lock-Datei neben den Daten).
+    Noetig fuer Lesen-Aendern-Schreiben, das atomare Schreiben allein schuetzt nicht vor
+    verlorenen Aenderungen paralleler Prozesse.
+    """
+    lock_path = store_path(name, "lock")
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    with open(lock_path, "a+") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def load_frame(name):
+    """
+    Liest einen gespeicherten DataFrame.
+    Returns:
+    DataFrame oder None, falls nichts gespeichert ist oder die Datei unlesbar ist.
+    """
+    path = store_path(name)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception as e:
+        logging.warning("Failed to read local store %s, ignoring it: %s", path, e)
+        return None
+
+
+def _write_atomic(name, path, write):
+    """Schreibt ueber write(tmp_path) in eine temporaere Datei und ersetzt path atomar."""
+    directory = os.path.dirname(path)
+    tmp_path = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+        os.close(fd)
+        write(tmp_path)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        logging.warning("Failed to write local store %s: %s", path, e)
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+
+def save_frame(name, df):
+    """
+    Schreibt einen DataFrame atomar in den lokalen Speicher.
+    Returns:
+    bool: True bei Erfolg. Ein Fehler beim Schreiben ist nie fatal, die Daten
+    werden dann beim naechsten Refresh eben wieder geholt.
+    """
+    return _write_atomic(name, store_path(name), df.to_parquet)
+
+
+def load_json(name):
+    """Liest einen gespeicherten JSON-Datensatz, None falls nicht vorhanden oder unlesbar."""
+    path = store_path(name, "json")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logging.warning("Failed to read local store %s, ignoring it: %s", path, e)
+        return None
+
+
+def save_json(name, data):
+    """Schreibt einen JSON-Datensatz atomar in den lokalen Speicher. Returns: bool wie save_frame."""
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+    return _write_atomic(name, store_path(name, "json"), write)
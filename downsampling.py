@@ -0,0 +1,73 @@
+"""
+downsampling.py - Serverseitiges Downsampling der Chart-Zeitreihen.
+
+Largest-Triangle-Three-Buckets (LTTB): die Reihe wird in gleich grosse Buckets geteilt,
+pro Bucket bleibt der Punkt, der mit dem zuletzt gewaehlten Punkt und dem Mittelwert des
+naechsten Buckets das groesste Dreieck bildet. So bleiben Spitzen und Wendepunkte
+erhalten, waehrend die Zahl der Punkte pro Trace fix begrenzt ist. Der erste und der
+letzte Punkt bleiben immer erhalten.
+"""
+
+import numpy as np
+
+from config import CHART_CONFIG
+
+
+def max_points_per_trace():
+    """Punkte-Budget pro Trace: Maximum aus der Konfiguration, begrenzt durch die Pixelbreite."""
+    return min(CHART_CONFIG["MAX_POINTS_PER_TRACE"], CHART_CONFIG["PIXEL_WIDTH"] * CHART_CONFIG["POINTS_PER_PIXEL"])
+
+
+def lttb_indices(x, y, n_out):
+    """Indizes der n_out Punkte, die LTTB aus (x, y) auswaehlt (x aufsteigend, keine NaN)."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket i umfasst [edges[i], edges[i + 1]), erster und letzter Punkt sind eigene Buckets
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.intp) + 1
+    indices = np.empty(n_out, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    selected = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        ax, ay = x[selected], y[selected]
+        area = np.abs((ax - avg_x) * (y[start:end] - ay) - (ax - x[start:end]) * (avg_y - ay))
+        selected = start + int(np.argmax(area))
+        indices[i + 1] = selected
+    return indices
+
+
+def downsample_series(index, values, max_points=None, log_y=False):
+    """
+    Reduziert eine Zeitreihe auf hoechstens max_points Punkte (LTTB).
+
+    Args:
+        index: DatetimeIndex oder Array mit Zeitpunkten
+        values: y-Werte
+        max_points: Punkte-Budget (Default: max_points_per_trace())
+        log_y: Auswahl auf log(y), passend zu log-skalierten Achsen
+
+    Returns:
+        (x, y) als Arrays, unveraendert wenn die Reihe schon klein genug ist.
+    """
+    max_points = max_points_per_trace() if max_points is None else max_points
+    x = np.asarray(index)
+    y = np.asarray(values, dtype=float)
+    if len(y) <= max_points:
+        return x, y
+
+    finite = np.isfinite(y) & (y > 0) if log_y else np.isfinite(y)
+    x, y = x[finite], y[finite]
+    if len(y) <= max_points:
+        return x, y
+
+    x_numeric = x.astype("datetime64[ns]").astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+    x_numeric = np.asarray(x_numeric, dtype=float) - float(x_numeric[0])
+    indices = lttb_indices(x_numeric, np.log(y) if log_y else y, max_points)
+    return x[indices], y[indices]
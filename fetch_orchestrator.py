@@ -0,0 +1,84 @@
+"""
+fetch_orchestrator.py - Paralleles Laden der Datenquellen mit Deadlines.
+
+Alle Quellen (Fear & Greed, yfinance und die On-Chain Fetcher) laufen gleichzeitig in
+einem Thread-Pool. Jede Quelle hat eine eigene Deadline, zusaetzlich gibt es eine
+Gesamt-Deadline. Das Ergebnis ist pro Quelle ein dict mit status ("ok", "error" oder
+"timeout"), value, elapsed und error, damit Aufrufer auch mit Teilergebnissen arbeiten
+koennen. Die schlechteste Ladezeit ist so die der langsamsten Quelle, nicht die Summe.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from config import FETCH_CONFIG
+
+
+def _source_result(status, value=None, elapsed=0.0, error=None):
+    return {"status": status, "value": value, "elapsed": elapsed, "error": error}
+
+
+def run_sources(sources, source_timeouts=None, overall_timeout=None):
+    """
+    Fuehrt alle Quellen parallel aus.
+
+    Args:
+        sources: dict name -> Funktion ohne Argumente
+        source_timeouts: dict name -> Deadline in Sekunden (Default: FETCH_CONFIG["SOURCE_TIMEOUTS"])
+        overall_timeout: Gesamt-Deadline in Sekunden (Default: FETCH_CONFIG["OVERALL_TIMEOUT"])
+
+    Returns:
+        dict name -> {"status", "value", "elapsed", "error"}
+    """
+    if source_timeouts is None:
+        source_timeouts = FETCH_CONFIG["SOURCE_TIMEOUTS"]
+    if overall_timeout is None:
+        overall_timeout = FETCH_CONFIG["OVERALL_TIMEOUT"]
+    if not sources:
+        return {}
+
+    start = time.monotonic()
+    overall_deadline = start + overall_timeout
+    deadlines = {
+        name: min(start + source_timeouts.get(name, overall_timeout), overall_deadline)
+        for name in sources
+    }
+
+    executor = ThreadPoolExecutor(max_workers=min(len(sources), FETCH_CONFIG["MAX_WORKERS"]),
+                                  thread_name_prefix="fetch")
+    futures = {executor.submit(func): name for name, func in sources.items()}
+    pending = set(futures)
+    results = {}
+
+    try:
+        while pending:
+            now = time.monotonic()
+            for future in [f for f in pending if deadlines[futures[f]] <= now]:
+                pending.discard(future)
+                future.cancel()
+                name = futures[future]
+                logging.warning("Source %s missed its deadline after %.1fs.", name, now - start)
+                results[name] = _source_result("timeout", elapsed=now - start,
+                                               error="deadline exceeded")
+            if not pending:
+                break
+
+            next_deadline = min(deadlines[futures[f]] for f in pending)
+            done, _ = wait(pending, timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                name = futures[future]
+                elapsed = time.monotonic() - start
+                try:
+                    results[name] = _source_result("ok", future.result(), elapsed)
+                except Exception as e:
+                    logging.warning("Source %s failed: %s", name, e)
+                    results[name] = _source_result("error", elapsed=elapsed, error=str(e))
+    finally:
+        # Haengende Quellen laufen im Hintergrund aus, der Aufrufer wartet nicht auf sie
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    logging.info("Fetched %d sources in %.1fs: %s", len(sources), time.monotonic() - start,
+                 ", ".join(f"{name}={results[name]['status']}" for name in sources))
+    return results
@@ -0,0 +1,89 @@
+"""
+halving.py - Vorberechneter Halving-Kalender fuer Strategie, Datenverarbeitung und UI.
+
+Die Halving-Daten aus config.BITCOIN_HALVINGS werden einmal beim Import geparst und
+als sortiertes datetime64-Array abgelegt. Alle Abfragen ("letztes Halving", "Monate
+seit Halving", "im Kauf-Sperrfenster") laufen per searchsorted in O(log n), skalare
+Abfragen nutzen denselben Array-Pfad, damit beide immer dasselbe Ergebnis liefern.
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import BITCOIN_HALVINGS
+
+# Ein Monat im Sinne der Strategie (mittlere Monatslaenge)
+DAYS_PER_MONTH = 30.44
+
+
+class HalvingIndex:
+    """Unveraenderlicher, sortierter Index ueber alle Halvings."""
+
+    __slots__ = ("numbers", "dates", "timestamps", "_window_ends")
+
+    def __init__(self, halvings):
+        items = sorted(halvings.items(), key=lambda item: item[1]["date"])
+        numbers = np.array([num for num, _ in items])
+        dates = np.array([data["date"] for _, data in items], dtype="datetime64[ns]")
+        numbers.flags.writeable = False
+        dates.flags.writeable = False
+        object.__setattr__(self, "numbers", numbers)
+        object.__setattr__(self, "dates", dates)
+        object.__setattr__(self, "timestamps", tuple(pd.Timestamp(d) for d in dates))
+        object.__setattr__(self, "_window_ends", {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("HalvingIndex is immutable")
+
+    def __len__(self):
+        return len(self.dates)
+
+    @staticmethod
+    def _as_dates(dates):
+        return np.asarray(pd.DatetimeIndex(np.atleast_1d(dates)).tz_localize(None), dtype="datetime64[ns]")
+
+    def last_positions(self, dates):
+        """Position des letzten Halvings <= Datum pro Eintrag, -1 vor dem ersten Halving."""
+        return np.searchsorted(self.dates, self._as_dates(dates), side="right") - 1
+
+    def months_since_array(self, dates):
+        """Monate seit dem letzten Halving pro Datum (float-Array, NaN vor dem ersten Halving)."""
+        dates = self._as_dates(dates)
+        positions = np.searchsorted(self.dates, dates, side="right") - 1
+        if len(self.dates) == 0:
+            return np.full(len(dates), np.nan)
+        days_since = (dates - self.dates[np.maximum(positions, 0)]) // np.timedelta64(1, "D")
+        return np.where(positions >= 0, days_since / DAYS_PER_MONTH, np.nan)
+
+    def in_buy_block_window_array(self, dates, buy_block_months):
+        """True, wo das Datum 0 bis buy_block_months Monate nach einem Halving liegt (Bull-Phase).
+        Vor dem ersten Halving ist nichts gesperrt."""
+        months = self.months_since_array(dates)
+        with np.errstate(invalid="ignore"):
+            return ~np.isnan(months) & (months < buy_block_months)
+
+    def last_halving(self, current_date=None):
+        """(Halving-Nummer, Datum als pd.Timestamp) des letzten Halvings, (None, None) davor."""
+        position = int(self.last_positions(_current_date(current_date))[0])
+        if position < 0:
+            return None, None
+        return int(self.numbers[position]), self.timestamps[position]
+
+    def months_since(self, current_date=None):
+        """Monate seit dem letzten Halving als float, None vor dem ersten Halving."""
+        months = float(self.months_since_array(_current_date(current_date))[0])
+        return None if np.isnan(months) else months
+
+    def window_ends(self, months):
+        """Datum `months` Kalendermonate nach jedem Halving (tuple von pd.Timestamp), gecacht."""
+        if months not in self._window_ends:
+            offset = pd.DateOffset(months=months)
+            self._window_ends[months] = tuple(ts + offset for ts in self.timestamps)
+        return self._window_ends[months]
+
+
+def _current_date(current_date):
+    return pd.Timestamp.now() if current_date is None else pd.Timestamp(current_date)
+
+
+HALVING_INDEX = HalvingIndex(BITCOIN_HALVINGS)
@@ -1,47 +1,94 @@
 import logging
 from config import INDICATORS
-from data_processing import process_fear_and_greed_data, process_historical_data, process_and_merge_data
+from data_processing import (process_fear_and_greed_data, process_historical_data, process_and_merge_timeframes,
+                             ONCHAIN_SOURCES, onchain_values)
+from fetch_orchestrator import run_sources
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+MARKET_SOURCES = {
+    "fear_and_greed": process_fear_and_greed_data,
+    "btc_prices": process_historical_data,
+}
+
+
+def source_output(source_results, name):
+    """Liefert das (success, message, DataFrame) Tuple einer Marktdatenquelle, auch bei Timeout/Fehler."""
+    result = source_results.get(name)
+    if result is None or result["status"] != "ok":
+        status = result["status"] if result is not None else "missing"
+        return False, f"Source {name} failed ({status})", None
+    return result["value"]
+
+
+def _merge_market_data(source_results):
+    """Merged die Ergebnisse der beiden Marktdatenquellen zu df_merged.
+    Returns: (success, message, data_processing.MergedData oder None), df_merged samt Zeitrahmen."""
+    fear_and_greed_fetched, fear_and_greed_message, df_fear_and_greed = source_output(source_results, "fear_and_greed")
+    logging.info(fear_and_greed_message)
+
+    historical_data_fetched, historical_data_message, df_historical_btc = source_output(source_results, "btc_prices")
+    logging.info(historical_data_message)
+
+    if fear_and_greed_fetched and historical_data_fetched:
+        logging.info("Merging and processing fetched data.")
+        merged = process_and_merge_timeframes(
+            df_historical_btc, df_fear_and_greed,
+            INDICATORS.get("LOWER_MM_QUANTIL"), INDICATORS.get("UPPER_MM_QUANTIL"),
+            INDICATORS.get("LOWER_FEAR_AND_GREED"), INDICATORS.get("UPPER_FEAR_AND_GREED"),
+            INDICATORS.get("BIGGER_SMA"), INDICATORS.get("SMALLER_SMA")
+        )
+        if merged is not None:
+            logging.info("Data processed successfully.")
+            return True, "Data processed successfully", merged
+        else:
+            logging.error("Data merge and processing returned None.")
+            return False, "Failed to merge and process data", None
+    else:
+        logging.error("Failed to process data due to unsuccessful fetch operations.")
+        return False, "Data processing failed", None
+
+
 def fetch_and_process_data():
     """
     This function is responsible for fetching and processing Bitcoin (BTC) market data. It performs two main tasks:
     1. Fetching Fear and Greed Index Data.
     2. Fetching Historical BTC Data.
+    Both sources are fetched concurrently (fetch_orchestrator).
     If both data types are successfully fetched, the method merges and processes these datasets.
     Returns:
     - On successful fetching and processing: A tuple (True, combined success message, merged DataFrame)
     - On failure to retrieve data: A tuple (False, combined error message, None)
     """
     try:
-        logging.info("Fetching Fear and Greed Index data.")
-        fear_and_greed_fetched, fear_and_greed_message, df_fear_and_greed = process_fear_and_greed_data()
-        logging.info(fear_and_greed_message)
-
-        logging.info("Fetching Historical BTC data.")
-        historical_data_fetched, historical_data_message, df_historical_btc = process_historical_data()
-        logging.info(historical_data_message)
-
-        if fear_and_greed_fetched and historical_data_fetched:
-            logging.info("Merging and processing fetched data.")
-            df_merged = process_and_merge_data(
-                df_historical_btc, df_fear_and_greed,
-                INDICATORS.get("LOWER_MM_QUANTIL"), INDICATORS.get("UPPER_MM_QUANTIL"),
-                INDICATORS.get("LOWER_FEAR_AND_GREED"), INDICATORS.get("UPPER_FEAR_AND_GREED"),
-                INDICATORS.get("BIGGER_SMA"), INDICATORS.get("SMALLER_SMA")
-            )
-            if df_merged is not None:
-                logging.info("Data processed successfully.")
-                return True, "Data processed successfully", df_merged
-            else:
-                logging.error("Data merge and processing returned None.")
-                return False, "Failed to merge and process data", None
-        else:
-            logging.error("Failed to process data due to unsuccessful fetch operations.")
-            return False, "Data processing failed", None
+        logging.info("Fetching Fear and Greed Index and Historical BTC data.")
+        data_merged, message, merged = _merge_market_data(run_sources(MARKET_SOURCES))
+        return data_merged, message, merged.df_merged if merged is not None else None
 
     except Exception as e:
         logging.exception("An error occurred during data fetching and processing: %s", e)
         return False, "Data processing failed due to an error", None
+
+
+def fetch_dashboard_data():
+    """
+    Laedt alle sechs Quellen (Fear & Greed, BTC-Preise, CVDD, MVRV-Z, Markt- und
+    realisierte Kapitalisierung) gleichzeitig. Die Ladezeit entspricht damit der
+    langsamsten Quelle statt der Summe aller Quellen.
+    Returns:
+    Tuple (success, message, df_merged, onchain, source_status):
+    onchain ist das Tuple von data_processing.fetch_onchain_data, source_status ein
+    dict name -> "ok" / "error" / "timeout".
+    """
+    try:
+        logging.info("Fetching market and on-chain data concurrently.")
+        source_results = run_sources({**MARKET_SOURCES, **ONCHAIN_SOURCES})
+        source_status = {name: result["status"] for name, result in source_results.items()}
+        data_merged, message, merged = _merge_market_data(source_results)
+        df_merged = merged.df_merged if merged is not None else None
+        return data_merged, message, df_merged, onchain_values(source_results), source_status
+
+    except Exception as e:
+        logging.exception("An error occurred during data fetching and processing: %s", e)
+        return False, "Data processing failed due to an error", None, (None, None, None, None), {}
@@ -0,0 +1,119 @@
+"""
+http_client.py - Gemeinsame HTTP-Schicht fuer alle Fetcher.
+
+- Eine requests.Session pro Host mit Keep-Alive-Pool: Folgeanfragen an denselben Host
+  sparen TCP- und TLS-Handshake.
+- Wiederholungen bei Verbindungsfehlern und HTTP_CONFIG["RETRY_STATUSES"] mit
+  exponentiellem Backoff plus Jitter (urllib3 Retry), Retry-After wird beachtet. 429
+  wird bewusst nicht wiederholt, das behandeln die Aufrufer (siehe bitcoin_data_client).
+- Bedingte GETs: Antworten mit ETag oder Last-Modified werden (begrenzt) im Speicher
+  gehalten und beim naechsten Abruf mit If-None-Match / If-Modified-Since angefragt.
+  Bei 304 liefert get() den gespeicherten Body als normale 200-Antwort, Aufrufer merken
+  keinen Unterschied.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from config import HTTP_CONFIG
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+# URL inkl. Query -> (status_code, headers, body, encoding), aelteste zuerst
+_responses = OrderedDict()
+_responses_lock = threading.Lock()
+
+
+def _retry_policy(retries):
+    return Retry(total=retries, connect=retries, read=retries, status=retries,
+                 backoff_factor=HTTP_CONFIG["BACKOFF_FACTOR"], backoff_jitter=HTTP_CONFIG["BACKOFF_JITTER"],
+                 status_forcelist=HTTP_CONFIG["RETRY_STATUSES"], allowed_methods=frozenset({"GET"}),
+                 respect_retry_after_header=True, raise_on_status=False)
+
+
+def session_for(host, retry=True):
+    """Geteilte Session fuer einen Host, mit oder ohne automatische Wiederholungen."""
+    key = (host, retry)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_CONFIG["POOL_MAXSIZE"],
+                                  max_retries=_retry_policy(HTTP_CONFIG["RETRIES"] if retry else 0))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[key] = session
+        return session
+
+
+def _cached_response(cache_key):
+    with _responses_lock:
+        cached = _responses.get(cache_key)
+        if cached is not None:
+            _responses.move_to_end(cache_key)
+        return cached
+
+
+def _store_response(cache_key, response):
+    if len(response.content) > HTTP_CONFIG["CACHE_MAX_BODY_BYTES"]:
+        return
+    with _responses_lock:
+        _responses[cache_key] = (response.status_code, dict(response.headers), response.content, response.encoding)
+        _responses.move_to_end(cache_key)
+        while len(_responses) > HTTP_CONFIG["CACHE_ENTRIES"]:
+            _responses.popitem(last=False)
+
+
+def _replay(cached, not_modified):
+    """Baut aus einer gespeicherten Antwort wieder ein requests.Response."""
+    status_code, headers, body, encoding = cached
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response.encoding = encoding
+    response.url = not_modified.url
+    response.request = not_modified.request
+    response.elapsed = not_modified.elapsed
+    return response
+
+
+def get(url, params=None, headers=None, timeout=None, retry=True, conditional=True):
+    """
+    GET ueber die geteilte Session des Hosts.
+
+    Args:
+        retry: False fuer Quellen, bei denen jede Anfrage ein Kontingent belastet
+        conditional: ETag/Last-Modified nutzen und bei 304 den gespeicherten Body liefern
+
+    Returns:
+        requests.Response, wie requests.get
+    """
+    session = session_for(urlsplit(url).netloc, retry)
+    request_headers = dict(headers or {})
+    cache_key = requests.Request("GET", url, params=params).prepare().url
+    cached = _cached_response(cache_key) if conditional else None
+    if cached is not None:
+        cached_headers = CaseInsensitiveDict(cached[1])
+        if "ETag" in cached_headers:
+            request_headers["If-None-Match"] = cached_headers["ETag"]
+        if "Last-Modified" in cached_headers:
+            request_headers["If-Modified-Since"] = cached_headers["Last-Modified"]
+
+    response = session.get(url, params=params, headers=request_headers,
+                           timeout=HTTP_CONFIG["TIMEOUT"] if timeout is None else timeout)
+
+    if response.status_code == 304 and cached is not None:
+        logging.info("Not modified, serving cached response for %s", cache_key)
+        return _replay(cached, response)
+    if conditional and response.status_code == 200 and ("ETag" in response.headers or "Last-Modified" in response.headers):
+        _store_response(cache_key, response)
+    return response
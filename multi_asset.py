@@ -0,0 +1,195 @@
+"""
+multi_asset.py - Mayer-Multiple-Strategie fuer alle Assets aus TICKER_SYMBOLS auf einem breiten Frame.
+
+Alle Ticker werden in einem gebuendelten Download (yfinance.download) geholt und als
+breiter Frame der Schlusskurse gespeichert, eine Spalte pro Asset. Wie bei BTC wird danach
+nur das Ende inkrementell nachgeladen. SMA, Mayer Multiple, expanding Q10/Q90, Preislevels
+und Signal-Codes werden spaltenweise auf dem ganzen Frame berechnet (rolling/expanding
+ueber alle Spalten, NumPy-Broadcasting fuer die Signale), ohne Schleife pro Asset. Ein
+weiteres Asset kostet damit eine Spalte mehr Arithmetik und keinen weiteren Download.
+
+Logik wie process_and_merge_data fuer BTC: 200-Tage-SMA und Mayer Multiple auf der ganzen
+Historie, danach nur Tage mit Fear & Greed Index (marktweit, fuer alle Assets derselbe),
+darauf die expanding Quantile und die 4+4 Signal-Codes. Der Halving-Zyklus gilt fuer alle
+Assets. Vorausgesetzt sind taeglich gehandelte Assets (Krypto): Luecken am Wochenende
+wuerden das 200-Tage-Fenster nie fuellen.
+
+Ergebnis ist ein DataFrame mit MultiIndex-Spalten (Kennzahl, Asset), z.B.
+df_assets["mayer_multiple"] fuer alle Assets. asset_frame() liefert ein Asset im Format von
+df_merged, get_signal_status und calculate_price_levels funktionieren darauf unveraendert.
+"""
+
+import logging
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from cache import cache_data, cache_resource
+from config import BITCOIN_HALVINGS, STORAGE_CONFIG, STRATEGY_CONFIG, TICKER_SYMBOLS, UPSTREAM_OVERRIDE_URL
+from data_processing import SIGNAL_LABELS, _download_price_history, compute_signal_codes, frame_fingerprint
+from data_store import load_frame, save_frame
+
+MULTI_ASSET_STORE = "price_history_multi_asset"
+
+# Spalten pro Asset, Namen und dtypes wie in df_merged (data_processing._compact_merged_frame)
+ASSET_COLUMNS = {
+    "close": "float64",
+    "200_days_sma_for_mm": "float64",
+    "mayer_multiple": "float64",
+    "value": "float32",
+    "q90_expanding": "float64",
+    "q10_expanding": "float64",
+    "q90_price_level": "float32",
+    "q10_price_level": "float32",
+    "signal": "int8",
+}
+
+
+def _to_daily_index(index):
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.normalize().rename("date")
+
+
+def _download_closes(**history_kwargs):
+    """
+    Schlusskurse aller TICKER_SYMBOLS in einer Anfrage, breiter Frame (Spalte = Asset-Kuerzel).
+    Der Replay-Server kennt nur einzelne Ticker, im Replay-Modus wird pro Ticker geladen.
+    """
+    symbols = list(TICKER_SYMBOLS.values())
+    if UPSTREAM_OVERRIDE_URL:
+        df_closes = pd.DataFrame({symbol: _download_price_history(symbol, **history_kwargs)["Close"]
+                                  for symbol in symbols})
+    else:
+        import yfinance as yf
+        df_closes = yf.download(symbols, auto_adjust=True, actions=False, progress=False, threads=True,
+                                **history_kwargs)["Close"]
+    df_closes = df_closes.rename(columns={symbol: asset for asset, symbol in TICKER_SYMBOLS.items()})
+    df_closes.index = _to_daily_index(df_closes.index)
+    return df_closes.reindex(columns=list(TICKER_SYMBOLS)).sort_index()
+
+
+@cache_data(ttl=3600)  # Cache for 1 hour
+def fetch_multi_asset_prices():
+    """
+    Schlusskurse aller Assets, lokal gespeichert und inkrementell aktualisiert wie
+    process_historical_data. Aendern sich die TICKER_SYMBOLS, wird komplett neu geladen.
+    Returns:
+    Tuple (success, message, DataFrame mit DatetimeIndex "date" und einer Spalte pro Asset)
+    """
+    df_stored = load_frame(MULTI_ASSET_STORE)
+    if df_stored is not None and list(df_stored.columns) != list(TICKER_SYMBOLS):
+        logging.info("Ticker symbols changed, reloading the full multi-asset history.")
+        df_stored = None
+
+    try:
+        if df_stored is not None and not df_stored.empty:
+            refresh_bars = min(STORAGE_CONFIG["PRICE_REFRESH_BARS"], len(df_stored))
+            start_date = df_stored.index[-refresh_bars]
+            logging.info("Fetching prices of %s since %s (incremental).", ", ".join(TICKER_SYMBOLS), start_date.date())
+            # Fehlt einem Asset ein frischer Wert (NaN), bleibt der gespeicherte
+            df_closes = _download_closes(start=start_date.strftime("%Y-%m-%d")).combine_first(df_stored)
+        else:
+            logging.info("Fetching full price history of %s.", ", ".join(TICKER_SYMBOLS))
+            df_closes = _download_closes(period="max")
+
+        if df_closes.empty:
+            return False, "No multi-asset price data available!", None
+        df_closes = df_closes.reindex(columns=list(TICKER_SYMBOLS)).sort_index()
+        save_frame(MULTI_ASSET_STORE, df_closes)
+        return True, "Multi-asset prices successfully fetched!", df_closes
+
+    except Exception as e:
+        if df_stored is not None and not df_stored.empty:
+            logging.warning("Failed to refresh multi-asset prices, using local store: %s", e)
+            return True, "Multi-asset prices loaded from local store (refresh failed)", df_stored
+        logging.exception("Failed to fetch multi-asset prices: %s", e)
+        return False, f"Error fetching multi-asset prices: {e}", None
+
+
+def compute_asset_indicators(df_closes, df_fear_and_greed):
+    """
+    Ungecachte Berechnung aller Kennzahlen fuer alle Assets, siehe process_multi_asset_data.
+    Returns:
+    DataFrame mit MultiIndex-Spalten (Kennzahl aus ASSET_COLUMNS, Asset), Index "date".
+    """
+    df_closes = df_closes.astype("float64")
+    sma_200 = df_closes.rolling(window=200, min_periods=200).mean()
+    mayer_multiple = df_closes / sma_200
+
+    fear_and_greed = pd.to_numeric(df_fear_and_greed.set_index("date")["value"], errors="coerce")
+    fear_and_greed.index = _to_daily_index(fear_and_greed.index)
+    fear_and_greed = fear_and_greed[~fear_and_greed.index.duplicated(keep="last")]
+
+    # Wie der Inner-Merge bei BTC: Tage mit F&G, an denen mindestens ein Asset einen SMA hat
+    rows = sma_200.notna().any(axis=1) & df_closes.index.isin(fear_and_greed.index)
+    df_closes, sma_200, mayer_multiple = df_closes[rows], sma_200[rows], mayer_multiple[rows]
+    fear_and_greed = fear_and_greed.reindex(df_closes.index)
+
+    # Expanding ueberspringt NaN: ein spaeter gestartetes Asset bekommt seine Quantile aus
+    # den eigenen Beobachtungen, genau wie bei einer Einzelberechnung
+    expanding = mayer_multiple.expanding(min_periods=STRATEGY_CONFIG['Q_MIN_PERIODS'])
+    q90 = expanding.quantile(STRATEGY_CONFIG['SELL_MM_QUANTILE'])
+    q10 = expanding.quantile(STRATEGY_CONFIG['BUY_MM_QUANTILE'])
+
+    signal_codes = compute_signal_codes(
+        df_closes.index.to_numpy(), mayer_multiple.to_numpy(), q10.to_numpy(), q90.to_numpy(),
+        fear_and_greed.to_numpy(dtype=float)[:, np.newaxis],
+        STRATEGY_CONFIG['SELL_FG_THRESHOLD'], STRATEGY_CONFIG.get('BUY_BLOCK_MONTHS', 18)
+    )
+
+    columns = {
+        "close": df_closes,
+        "200_days_sma_for_mm": sma_200,
+        "mayer_multiple": mayer_multiple,
+        "value": pd.DataFrame(np.broadcast_to(fear_and_greed.to_numpy()[:, np.newaxis], df_closes.shape),
+                              index=df_closes.index, columns=df_closes.columns),
+        "q90_expanding": q90,
+        "q10_expanding": q10,
+        "q90_price_level": sma_200 * q90,
+        "q10_price_level": sma_200 * q10,
+        "signal": pd.DataFrame(signal_codes, index=df_closes.index, columns=df_closes.columns),
+    }
+    return pd.concat({name: frame.astype(ASSET_COLUMNS[name]) for name, frame in columns.items()}, axis=1)
+
+
+# cache_resource wie bei df_merged: ein Frame fuer alle Aufrufer, nur lesen
+@cache_resource(ttl=3600, max_entries=4, show_spinner=False)
+def _multi_asset_cached(_df_closes, _df_fear_and_greed, fingerprint, params):
+    try:
+        df_assets = compute_asset_indicators(_df_closes, _df_fear_and_greed)
+    except Exception as e:
+        logging.exception("Failed to process multi-asset data: %s", e)
+        return None
+    df_assets.attrs["data_version"] = f"{zlib.crc32(repr((fingerprint, params)).encode()):08x}"
+    return df_assets
+
+
+def process_multi_asset_data(df_closes, df_fear_and_greed):
+    """
+    Kennzahlen aller Assets, memoisiert auf dem Fingerabdruck beider Frames plus
+    STRATEGY_CONFIG und Halvings (wie process_and_merge_data).
+    Returns:
+    DataFrame mit MultiIndex-Spalten (Kennzahl, Asset) oder None bei Fehlern.
+    """
+    fingerprint = (frame_fingerprint(df_closes), frame_fingerprint(df_fear_and_greed))
+    params = (
+        tuple(TICKER_SYMBOLS.items()),
+        tuple(sorted(STRATEGY_CONFIG.items())),
+        tuple((num, data["date"]) for num, data in sorted(BITCOIN_HALVINGS.items())),
+    )
+    return _multi_asset_cached(df_closes, df_fear_and_greed, fingerprint, params)
+
+
+def asset_frame(df_assets, asset):
+    """
+    Ein Asset im Format von df_merged (Signal kategorial), ab dem ersten Tag mit Mayer Multiple.
+    Args:
+        asset: Kuerzel aus TICKER_SYMBOLS, z.B. "ETH"
+    """
+    df_asset = df_assets.xs(asset, axis=1, level=1)
+    df_asset = df_asset[df_asset["mayer_multiple"].notna()].copy()
+    df_asset["signal"] = pd.Categorical.from_codes(df_asset["signal"].to_numpy(), categories=SIGNAL_LABELS)
+    return df_asset
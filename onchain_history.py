@@ -0,0 +1,139 @@
+"""
+onchain_history.py - Lokale Zeitreihen der On-Chain Metriken (CVDD, MVRV-Z, Markt- und
+realisierte Kapitalisierung).
+
+Ein breiter Frame im Parquet-Speicher (data_store), ein Tag pro Zeile und eine Spalte pro
+Metrik. Befuellt wird er einmalig per Backfill der kompletten Historie von
+bitcoin-data.com (ein Token pro Metrik, siehe bitcoin_data_client) und danach durch die
+taeglichen /last-Abfragen der Fetcher in data_processing. Fortgeschrieben wird nur nach
+vorn: pro Metrik wird hoechstens der Tag ihres letzten Werts ueberschrieben, aeltere Werte
+bleiben unveraendert.
+
+CVDD gibt es nur als aktuellen Wert (axeladlerjr.com, der CVDD-Endpunkt von
+bitcoin-data.com wird bewusst nicht genutzt), seine Historie waechst ab dem ersten Abruf
+Tag fuer Tag.
+
+Aufruf fuer den einmaligen Backfill:
+    python onchain_history.py backfill
+"""
+
+import argparse
+import logging
+import time
+
+import pandas as pd
+
+import bitcoin_data_client
+from data_store import load_frame, locked, save_frame
+
+HISTORY_STORE = "onchain_history"
+
+# Spalte -> (Tag, Wert) des letzten record-Aufrufs in diesem Prozess
+_last_recorded = {}
+
+# Spalten wie die Namen in data_processing.ONCHAIN_SOURCES, mit Pfad bei bitcoin-data.com
+COLUMNS = {
+    "cvdd": None,
+    "mvrv": "mvrv-zscore",
+    "market_cap": "market-cap",
+    "realized_cap": "realized-cap",
+}
+
+
+def column_for_path(path):
+    return next(column for column, column_path in COLUMNS.items() if column_path == path)
+
+
+def _empty_history():
+    return pd.DataFrame({column: pd.Series(dtype="float64") for column in COLUMNS},
+                        index=pd.DatetimeIndex([], name="date"))
+
+
+def load_history():
+    """Gespeicherte Historie, DataFrame (DatetimeIndex "date", eine Spalte pro Metrik) oder None."""
+    return load_frame(HISTORY_STORE)
+
+
+def record(column, value, date=None):
+    """
+    Schreibt den Wert einer Metrik fuer den Tag `date` fort.
+    Args:
+        date: Tag, zu dem der Wert gehoert (z.B. "d" der API als "2026-10-16"), Default: heute.
+            Nur fuer Werte ohne eigenes Datum (CVDD) ist das der Abruftag.
+    Returns:
+    bool: True, wenn der Wert gespeichert wurde. Werte vor dem letzten gespeicherten Tag
+    der Metrik und unveraenderte Werte werden ignoriert (ohne Schreiben, bei einer
+    Wiederholung im selben Prozess auch ohne Lesen), Fehler beim Speichern sind nie fatal.
+    """
+    date = pd.Timestamp(time.time(), unit="s") if date is None else pd.Timestamp(date)
+    date = date.normalize()
+    value = float(value)
+    if _last_recorded.get(column) == (date, value):
+        return False
+    try:
+        with locked(HISTORY_STORE):
+            df_history = load_history()
+            if df_history is None:
+                df_history = _empty_history()
+            last_date = df_history[column].last_valid_index()
+            if last_date is not None and date < last_date:
+                return False
+            if date == last_date and df_history.at[date, column] == value:
+                _last_recorded[column] = (date, value)
+                return False
+            df_history.loc[date, column] = value
+            saved = save_frame(HISTORY_STORE, df_history.sort_index())
+            if saved:
+                _last_recorded[column] = (date, value)
+            return saved
+    except Exception as e:
+        logging.warning("Failed to record %s in the on-chain history: %s", column, e)
+        return False
+
+
+def backfill():
+    """
+    Laedt die komplette Historie aller Metriken von bitcoin-data.com und fuehrt sie mit dem
+    Speicher zusammen (Backfill-Werte haben Vorrang). Returns: dict Spalte -> Anzahl Tage.
+    """
+    fetched = {}
+    for column, path in COLUMNS.items():
+        if path is None:
+            continue
+        series = bitcoin_data_client.fetch_history(path, bitcoin_data_client.METRICS[path][0])
+        if series is not None:
+            fetched[column] = series[~series.index.duplicated(keep="last")]
+
+    if fetched:
+        with locked(HISTORY_STORE):
+            df_history = load_history()
+            df_backfill = pd.DataFrame(fetched)
+            if df_history is not None:
+                df_backfill = df_backfill.combine_first(df_history)
+            save_frame(HISTORY_STORE, df_backfill.reindex(columns=list(COLUMNS)).sort_index())
+    return {column: len(series) for column, series in fetched.items()}
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Lokale On-Chain Historie")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("backfill", help="Komplette Historie von bitcoin-data.com laden (3 Anfragen)")
+    subparsers.add_parser("info", help="Umfang der gespeicherten Historie anzeigen")
+    args = parser.parse_args()
+
+    if args.command == "backfill":
+        for column, days in backfill().items():
+            logging.info("Backfilled %s: %d days", column, days)
+    df_history = load_history()
+    if df_history is None:
+        print("No on-chain history stored yet.")
+        return
+    for column in COLUMNS:
+        series = df_history[column].dropna()
+        span = f"{series.index[0]:%Y-%m-%d} .. {series.index[-1]:%Y-%m-%d}" if len(series) else "-"
+        print(f"{column:<14} {len(series):>6} days   {span}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+quantiles.py - Inkrementelle expanding Quantile (Q10/Q90 des Mayer Multiple).
+
+ExpandingQuantiles haelt alle bisherigen Beobachtungen sortiert und berechnet beim
+Anhaengen neuer Werte alle gewuenschten Quantile in einem Durchgang. Ein Tages-Update
+kostet so k binaere Suchen plus Einfuegen statt zwei kompletter expanding()-Laeufe.
+Die Interpolation entspricht pandas' expanding().quantile() (linear), die Ergebnisse
+sind identisch.
+
+update_expanding_quantiles haelt pro Schluessel einen Tracker samt Verlauf im Speicher
+des Prozesses. Beim naechsten Refresh werden nur die Werte ab dem ersten geaenderten Tag
+(die letzten Kerzen koennen sich noch aendern) aus dem Tracker entfernt und die neuen
+angehaengt, ohne die Beobachtungen neu zu sortieren. Geaenderte Staende werden zusaetzlich
+im lokalen Speicher (data_store) abgelegt, mit den sortierten Beobachtungen: nach einem
+Neustart oder in einem neuen CLI-Lauf geht es von dort inkrementell weiter, gelesen wird
+die Datei nur, solange es keinen Stand im Speicher gibt.
+"""
+
+import bisect
+import logging
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from data_store import load_frame, save_frame
+
+# Ab so vielen neuen Werten ist ein voller pandas-Lauf (C-Implementierung) schneller
+# als das Einfuegen in die sortierte Liste.
+INCREMENTAL_MAX_NEW_VALUES = 1000
+
+# Name im Speicher -> letzter Stand: Tracker ueber alle Werte plus Eingaben und Ergebnisse
+_TrackerState = namedtuple("_TrackerState", ["tracker", "dates", "values", "result"])
+_states = {}
+_states_lock = threading.Lock()
+
+
+def _quantile_column(quantile):
+    return f"q{quantile:g}"
+
+
+class ExpandingQuantiles:
+    """Expanding Quantile mit inkrementellem Update, NaN-Werte werden wie bei pandas uebersprungen."""
+
+    def __init__(self, quantiles, min_periods, values=None):
+        self.quantiles = tuple(quantiles)
+        self.min_periods = min_periods
+        self._sorted = []
+        if values is not None:
+            values = np.asarray(values, dtype=float)
+            self._sorted = np.sort(values[~np.isnan(values)]).tolist()
+
+    @classmethod
+    def from_sorted(cls, quantiles, min_periods, sorted_values):
+        """Tracker aus bereits sortierten Beobachtungen ohne NaN (z.B. aus dem Speicher)."""
+        tracker = cls(quantiles, min_periods)
+        tracker._sorted = np.asarray(sorted_values, dtype=float).tolist()
+        return tracker
+
+    def sorted_values(self):
+        """Alle Beobachtungen aufsteigend sortiert, Array."""
+        return np.array(self._sorted)
+
+    def __len__(self):
+        return len(self._sorted)
+
+    def current(self):
+        """Aktuelle Quantile als Array (NaN solange weniger als min_periods Beobachtungen)."""
+        nobs = len(self._sorted)
+        result = np.full(len(self.quantiles), np.nan)
+        if nobs == 0 or nobs < self.min_periods:
+            return result
+        for i, quantile in enumerate(self.quantiles):
+            if nobs == 1:
+                result[i] = self._sorted[0]
+                continue
+            idx_with_fraction = quantile * (nobs - 1)
+            idx = int(idx_with_fraction)
+            if idx == idx_with_fraction:
+                result[i] = self._sorted[idx]
+            else:
+                vlow = self._sorted[idx]
+                vhigh = self._sorted[idx + 1]
+                result[i] = vlow + (vhigh - vlow) * (idx_with_fraction - idx)
+        return result
+
+    def remove(self, values):
+        """Entfernt fruehere Beobachtungen wieder (NaN wird ignoriert)."""
+        for value in np.asarray(values, dtype=float):
+            if not np.isnan(value):
+                del self._sorted[bisect.bisect_left(self._sorted, float(value))]
+
+    def extend(self, values):
+        """
+        Haengt k neue Beobachtungen an.
+        Returns:
+        Array (k, len(quantiles)) mit den Quantilen nach jeder neuen Beobachtung.
+        """
+        values = np.asarray(values, dtype=float)
+        result = np.empty((len(values), len(self.quantiles)))
+        for row, value in enumerate(values):
+            if not np.isnan(value):
+                bisect.insort(self._sorted, float(value))
+            result[row] = self.current()
+        return result
+
+
+def expanding_quantiles(values, quantiles, min_periods):
+    """Voller expanding-Lauf ueber alle Werte (pandas), Array (n, len(quantiles))."""
+    expanding = pd.Series(np.asarray(values, dtype=float)).expanding(min_periods=min_periods)
+    return np.column_stack([expanding.quantile(quantile).to_numpy() for quantile in quantiles])
+
+
+def _store_name(key, quantiles, min_periods):
+    columns = [_quantile_column(quantile) for quantile in quantiles]
+    return f"{key}_{min_periods}_{'_'.join(columns)}"
+
+
+def _load_state(store_name, quantiles, min_periods, columns):
+    """Gespeicherter Stand oder None. Die sortierten Beobachtungen liegen in der Spalte
+    "sorted", mit NaN auf die Laenge des Verlaufs aufgefuellt."""
+    stored = load_frame(store_name)
+    if stored is None or not {"date", "value", "sorted", *columns}.issubset(stored.columns):
+        return None
+    sorted_values = stored["sorted"].to_numpy(dtype=float)
+    tracker = ExpandingQuantiles.from_sorted(quantiles, min_periods, sorted_values[~np.isnan(sorted_values)])
+    return _TrackerState(tracker, stored["date"].to_numpy(dtype="datetime64[ns]"),
+                         stored["value"].to_numpy(dtype=float), stored[columns].to_numpy(dtype=float))
+
+
+def _save_state(store_name, state, columns):
+    sorted_values = np.full(len(state.values), np.nan)
+    sorted_values[:len(state.tracker)] = state.tracker.sorted_values()
+    df_state = pd.DataFrame({"date": state.dates, "value": state.values, "sorted": sorted_values})
+    df_state[columns] = state.result
+    save_frame(store_name, df_state)
+
+
+def _matching_prefix(dates, values, state):
+    """Anzahl fuehrender Tage, an denen Datum und Wert mit dem gemerkten Stand uebereinstimmen."""
+    n = min(len(state.dates), len(dates))
+    same = (state.dates[:n] == dates[:n]) & (
+        (state.values[:n] == values[:n]) | (np.isnan(state.values[:n]) & np.isnan(values[:n])))
+    return n if same.all() else int(np.argmin(same))
+
+
+def update_expanding_quantiles(dates, values, quantiles, min_periods, key):
+    """
+    Expanding Quantile fuer eine Datumsreihe, inkrementell gegenueber dem letzten Stand zu key.
+
+    Der Stand kommt aus dem Speicher des Prozesses, beim ersten Aufruf aus dem lokalen
+    Speicher (data_store). Der gemerkte Verlauf wird bis zum ersten Tag uebernommen, an dem
+    Datum oder Wert abweichen. Die Werte ab dort werden aus dem Tracker entfernt und die
+    neuen mit ExpandingQuantiles angehaengt. Gibt es keinen Stand oder sind es zu viele neue
+    Werte, wird voll neu gerechnet. Ein geaenderter Stand wird wieder gespeichert.
+
+    Returns:
+    DataFrame mit einer Spalte pro Quantil (Name q<quantil>), gleiche Laenge wie dates.
+    """
+    dates = np.array(dates, dtype="datetime64[ns]")
+    values = np.array(values, dtype=float)
+    columns = [_quantile_column(quantile) for quantile in quantiles]
+    store_name = _store_name(key, quantiles, min_periods)
+
+    with _states_lock:
+        state = _states.get(store_name)
+        if state is None:
+            state = _load_state(store_name, quantiles, min_periods, columns)
+        matching = 0 if state is None else _matching_prefix(dates, values, state)
+        changed = state is None or matching < len(state.values) or matching < len(values)
+
+        if 0 < matching and len(values) - matching <= INCREMENTAL_MAX_NEW_VALUES:
+            if changed:
+                logging.info("Updating expanding quantiles incrementally (%d new values).", len(values) - matching)
+            tracker = state.tracker
+            tracker.remove(state.values[matching:])
+            result = np.vstack([state.result[:matching], tracker.extend(values[matching:])])
+        else:
+            logging.info("Computing expanding quantiles over %d values.", len(values))
+            result = expanding_quantiles(values, quantiles, min_periods)
+            tracker = ExpandingQuantiles(quantiles, min_periods, values)
+
+        _states[store_name] = _TrackerState(tracker, dates, values, result)
+        if changed:
+            _save_state(store_name, _states[store_name], columns)
+    return pd.DataFrame(result.copy(), columns=columns)
+
+
+def reset_expanding_quantiles():
+    """Verwirft alle Staende im Speicher des Prozesses, der naechste Aufruf liest wieder den
+    lokalen Speicher (Benchmarks leeren zusaetzlich das Speicherverzeichnis)."""
+    with _states_lock:
+        _states.clear()
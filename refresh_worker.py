@@ -0,0 +1,154 @@
+"""
+refresh_worker.py - Hintergrund-Refresh aller Datenquellen mit Snapshots (stale-while-revalidate).
+
+Ein Worker-Thread pro Serverprozess aktualisiert die Quellen in eigenem Rhythmus
+(REFRESH_CONFIG: Marktdaten stuendlich, On-Chain taeglich), baut df_merged neu und
+veroeffentlicht das Ergebnis als unveraenderlichen Snapshot. Seitenanfragen lesen nur den
+jeweils letzten Snapshot und warten nie auf Netzwerkzugriffe, ausser beim allerersten
+Aufruf nach dem Serverstart.
+
+Schlaegt eine Quelle fehl, bleibt ihr letzter erfolgreicher Wert im Snapshot (Status
+"stale") und die Gruppe wird nach REFRESH_CONFIG["RETRY_DELAY"] erneut versucht.
+"""
+
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from cache import cache_resource
+from config import REFRESH_CONFIG
+from data_processing import ONCHAIN_SOURCES, onchain_values, stale_bitcoin_data_values
+from fetch_orchestrator import run_sources
+from helpers import MARKET_SOURCES, _merge_market_data
+
+SOURCE_GROUPS = {
+    "market": MARKET_SOURCES,
+    "onchain": ONCHAIN_SOURCES,
+}
+
+# Snapshot und sein df_merged werden nach dem Veroeffentlichen nicht mehr veraendert.
+# onchain_stale: bitcoin-data.com Werte, die der letzte Refresh nur aus dem Ledger holen
+# konnte (Anzeigename -> Abrufzeitpunkt als Unix-Zeit)
+Snapshot = namedtuple("Snapshot", ["success", "message", "df_merged", "onchain", "source_status", "created_at",
+                                   "timeframes", "onchain_stale"])
+
+
+def _source_ok(result):
+    """Erfolg einer Quelle: Status ok und ein brauchbarer Wert. Marktquellen liefern
+    (success, message, df), die On-Chain Fetcher None bei Fehler."""
+    if result["status"] != "ok" or result["value"] is None:
+        return False
+    value = result["value"]
+    return bool(value[0]) if isinstance(value, tuple) else True
+
+
+class RefreshWorker:
+    """Aktualisiert die Quellengruppen im Hintergrund und haelt den letzten Snapshot."""
+
+    def __init__(self, groups=None, intervals=None, retry_delay=None):
+        self.groups = SOURCE_GROUPS if groups is None else groups
+        self.intervals = REFRESH_CONFIG["INTERVALS"] if intervals is None else intervals
+        self.retry_delay = REFRESH_CONFIG["RETRY_DELAY"] if retry_delay is None else retry_delay
+        self._results = {}
+        self._source_status = {}
+        self._next_run = {group: 0.0 for group in self.groups}
+        self._snapshot = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="refresh-worker", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def latest(self, timeout=None):
+        """Letzter Snapshot, wartet hoechstens `timeout` Sekunden auf den ersten. None, wenn noch keiner existiert."""
+        if timeout:
+            self._ready.wait(timeout)
+        return self._snapshot
+
+    def refresh(self, groups):
+        """Laedt die Quellen der Gruppen neu und veroeffentlicht einen neuen Snapshot."""
+        sources = {}
+        for group in groups:
+            for name, func in self.groups[group].items():
+                # Cache-Eintrag verwerfen, sonst kaeme bis zum TTL-Ablauf der alte Wert
+                if hasattr(func, "clear"):
+                    func.clear()
+                sources[name] = func
+
+        failed_groups = set()
+        for name, result in run_sources(sources).items():
+            if _source_ok(result):
+                self._results[name] = result
+                self._source_status[name] = "ok"
+                continue
+            failed_groups.update(group for group in groups if name in self.groups[group])
+            status = result["status"] if result["status"] != "ok" else "error"
+            if name in self._results and _source_ok(self._results[name]):
+                logging.warning("Source %s failed (%s), keeping previous value.", name, status)
+                self._source_status[name] = "stale"
+            else:
+                self._results[name] = result
+                self._source_status[name] = status
+
+        now = time.monotonic()
+        for group in groups:
+            self._next_run[group] = now + (self.retry_delay if group in failed_groups else self.intervals[group])
+
+        data_merged, message, merged = _merge_market_data(self._results)
+        df_merged, timeframes = merged if merged is not None else (None, None)
+        if not data_merged and self._snapshot is not None and self._snapshot.success:
+            # Merge fehlgeschlagen: alten Frame weiter ausliefern
+            data_merged, message = True, self._snapshot.message
+            df_merged, timeframes = self._snapshot.df_merged, self._snapshot.timeframes
+        self._snapshot = Snapshot(data_merged, message, df_merged, onchain_values(self._results),
+                                  dict(self._source_status), time.time(), timeframes, stale_bitcoin_data_values())
+        self._ready.set()
+        logging.info("Published snapshot (%s): %s", ", ".join(groups),
+                     ", ".join(f"{name}={status}" for name, status in self._source_status.items()))
+        return self._snapshot
+
+    def _run(self):
+        while not self._stop.is_set():
+            now = time.monotonic()
+            due = [group for group, next_run in self._next_run.items() if next_run <= now]
+            if not due:
+                self._stop.wait(min(self._next_run.values()) - now)
+                continue
+            try:
+                self.refresh(due)
+            except Exception as e:
+                logging.exception("Background refresh of %s failed: %s", ", ".join(due), e)
+                for group in due:
+                    self._next_run[group] = time.monotonic() + self.retry_delay
+                self._ready.set()
+
+
+@cache_resource(show_spinner=False)
+def get_refresh_worker():
+    """Ein gestarteter Worker pro Serverprozess, geteilt von allen Sessions (Dashboard) bzw. Clients (api.py)."""
+    return RefreshWorker().start()
+
+
+def latest_dashboard_data():
+    """
+    Dashboard-Daten aus dem letzten Snapshot, ohne Netzwerkzugriff im Request.
+    Returns:
+    Tuple wie helpers.fetch_dashboard_data plus Zeitrahmen und veraltete On-Chain Werte aus
+    demselben Snapshot:
+    (success, message, df_merged, onchain, source_status, timeframes, onchain_stale)
+    """
+    snapshot = get_refresh_worker().latest(timeout=REFRESH_CONFIG["INITIAL_WAIT"])
+    if snapshot is None:
+        return (False, "Daten werden noch geladen, bitte die Seite gleich neu laden.", None,
+                (None, None, None, None), {}, None, {})
+    return (snapshot.success, snapshot.message, snapshot.df_merged, snapshot.onchain, snapshot.source_status,
+            snapshot.timeframes, snapshot.onchain_stale)
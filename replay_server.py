@@ -0,0 +1,245 @@
+"""
+replay_server.py - Aufzeichnen und lokales Abspielen aller externen Datenquellen.
+
+Mit `record` werden die Antworten aller Quellen (alternative.me, bitcoin-data.com,
+axeladlerjr.com und die yfinance-Kurshistorie) einmal live abgerufen und als Fixtures
+gespeichert. `serve` startet einen lokalen HTTP-Server, der diese Fixtures ausliefert.
+Das Dashboard nutzt ihn, sobald DASHBOARD_UPSTREAM_URL gesetzt ist (siehe
+config.upstream_url), so lassen sich Fetch-, Cache- und Fallback-Pfade offline und
+reproduzierbar messen und belasten.
+
+Der Server kann Latenz, Fehler und Rate-Limits einspielen und beantwortet bedingte
+Anfragen (If-None-Match) mit 304. Fear & Greed beachtet den limit-Parameter und die
+yfinance-Historie den start-Parameter, damit auch die inkrementellen Refreshes
+realistisch laufen.
+
+Aufruf:
+    python replay_server.py record                         # Fixtures live aufzeichnen
+    python replay_server.py serve --port 8765 --latency 300 --jitter 100 --error-rate 0.05 \\
+        --rate-limit 10 --rate-window 3600
+    DASHBOARD_UPSTREAM_URL=http://127.0.0.1:8765 DASHBOARD_DATA_DIR=.replay-data streamlit run main.py
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from config import TICKER_SYMBOLS, TIME_PERIODS
+
+DEFAULT_FIXTURES_DIR = "fixtures"
+
+# Alle Endpunkte, die data_processing abfragt (ohne yfinance, das kommt als CSV)
+RECORD_URLS = [
+    f"https://api.alternative.me/fng/?limit={TIME_PERIODS['DAYS_PERIODE']}",
+    "https://bitcoin-data.com/v1/mvrv-zscore/last",
+    "https://bitcoin-data.com/v1/market-cap/last",
+    "https://bitcoin-data.com/v1/realized-cap/last",
+    # Komplette Historien fuer den Backfill (onchain_history.py)
+    "https://bitcoin-data.com/v1/mvrv-zscore",
+    "https://bitcoin-data.com/v1/market-cap",
+    "https://bitcoin-data.com/v1/realized-cap",
+    "https://axeladlerjr.com/charts/bitcoin-cvdd/",
+]
+RECORD_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+
+def fixture_path(fixtures_dir, host, path):
+    """Dateiname eines Fixtures, Query-Parameter gehoeren nicht zum Schluessel."""
+    name = re.sub(r"[^A-Za-z0-9.-]+", "_", f"{host}{path}").strip("_")
+    return os.path.join(fixtures_dir, f"{name}.json")
+
+
+def price_history_path(fixtures_dir, ticker_symbol):
+    return os.path.join(fixtures_dir, f"yfinance_{ticker_symbol}.csv")
+
+
+def record(fixtures_dir):
+    """Ruft alle Quellen live ab und speichert die Antworten als Fixtures."""
+    import requests
+    import yfinance as yf
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    for url in RECORD_URLS:
+        parts = urlsplit(url)
+        try:
+            response = requests.get(url, headers=RECORD_HEADERS, timeout=30)
+        except requests.RequestException as e:
+            logging.warning("Failed to record %s: %s", url, e)
+            continue
+        fixture = {
+            "url": url,
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type", "application/octet-stream"),
+            "body": response.text,
+        }
+        with open(fixture_path(fixtures_dir, parts.netloc, parts.path), "w", encoding="utf-8") as f:
+            json.dump(fixture, f)
+        logging.info("Recorded %s (%d, %d bytes)", url, response.status_code, len(response.content))
+
+    for ticker_symbol in TICKER_SYMBOLS.values():
+        df_history = yf.Ticker(ticker_symbol).history(period="max")
+        df_history.to_csv(price_history_path(fixtures_dir, ticker_symbol))
+        logging.info("Recorded yfinance history for %s (%d rows)", ticker_symbol, len(df_history))
+
+
+class FaultInjector:
+    """Latenz, zufaellige Fehler und ein Rate-Limit (gleitendes Fenster) fuer alle Anfragen."""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, rate_limit=None, rate_window=60.0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self._random = random.Random(seed)
+        self._requests = deque()
+        self._lock = threading.Lock()
+
+    def delay(self):
+        latency = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+    def rate_limited(self):
+        """Sekunden bis zur naechsten freien Anfrage, None wenn die Anfrage erlaubt ist."""
+        if not self.rate_limit:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            while self._requests and self._requests[0] <= now - self.rate_window:
+                self._requests.popleft()
+            if len(self._requests) >= self.rate_limit:
+                return self._requests[0] + self.rate_window - now
+            self._requests.append(now)
+            return None
+
+    def should_fail(self):
+        return self._random.random() < self.error_rate
+
+
+def make_handler(fixtures_dir, faults):
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            faults.delay()
+            retry_after = faults.rate_limited()
+            if retry_after is not None:
+                self._send(429, "application/json", json.dumps({"error": "rate limit exceeded"}),
+                           {"Retry-After": str(max(1, int(retry_after)))})
+                return
+            if faults.should_fail():
+                self._send(503, "application/json", json.dumps({"error": "injected failure"}))
+                return
+
+            parts = urlsplit(self.path)
+            segments = parts.path.lstrip("/").split("/", 1)
+            host, path = segments[0], "/" + (segments[1] if len(segments) > 1 else "")
+            query = parse_qs(parts.query)
+
+            if host == "yfinance":
+                self._serve_price_history(path, query)
+            else:
+                self._serve_fixture(host, path, query)
+
+        def _serve_fixture(self, host, path, query):
+            fixture_file = fixture_path(fixtures_dir, host, path)
+            if not os.path.exists(fixture_file):
+                self._send(404, "application/json", json.dumps({"error": f"no fixture for {host}{path}"}))
+                return
+            with open(fixture_file, encoding="utf-8") as f:
+                fixture = json.load(f)
+            body = fixture["body"]
+            if host == "api.alternative.me" and "limit" in query and fixture["status"] == 200:
+                # Fear & Greed: neueste Eintraege zuerst, limit schneidet wie die echte API ab
+                data_json = json.loads(body)
+                data_json["data"] = data_json["data"][:int(query["limit"][0])]
+                body = json.dumps(data_json)
+            self._send(fixture["status"], fixture["content_type"], body)
+
+        def _serve_price_history(self, path, query):
+            # Pfad: /<ticker>/history
+            ticker_symbol = path.strip("/").split("/")[0]
+            history_file = price_history_path(fixtures_dir, ticker_symbol)
+            if not os.path.exists(history_file):
+                self._send(404, "application/json", json.dumps({"error": f"no price history for {ticker_symbol}"}))
+                return
+            df_history = pd.read_csv(history_file, index_col="Date")
+            if "start" in query:
+                dates = pd.to_datetime(df_history.index, utc=True)
+                df_history = df_history[dates >= pd.Timestamp(query["start"][0], tz="UTC")]
+            buffer = io.StringIO()
+            df_history.to_csv(buffer)
+            self._send(200, "text/csv", buffer.getvalue())
+
+        def _send(self, status, content_type, body, headers=None):
+            payload = body.encode("utf-8")
+            if status == 200:
+                # ETag wie bei echten Quellen, damit bedingte GETs (http_client) greifen
+                etag = f'"{zlib.crc32(payload):08x}"'
+                headers = {**(headers or {}), "ETag": etag}
+                if self.headers.get("If-None-Match") == etag:
+                    status, payload = 304, b""
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            logging.info("replay %s - %s", self.address_string(), format % args)
+
+    return ReplayHandler
+
+
+def serve(fixtures_dir, host, port, faults):
+    server = ThreadingHTTPServer((host, port), make_handler(fixtures_dir, faults))
+    logging.info("Replay server for %s listening on http://%s:%d", fixtures_dir, host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Record/Replay der externen Datenquellen")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR, help="Verzeichnis der Fixtures")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("record", help="Alle Quellen live abrufen und speichern")
+
+    serve_parser = subparsers.add_parser("serve", help="Fixtures lokal ausliefern")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--latency", type=float, default=0, help="Latenz pro Anfrage in ms")
+    serve_parser.add_argument("--jitter", type=float, default=0, help="Zufaellige Abweichung der Latenz in ms")
+    serve_parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil Anfragen mit HTTP 503")
+    serve_parser.add_argument("--rate-limit", type=int, default=None, help="Max. Anfragen pro Fenster (danach HTTP 429)")
+    serve_parser.add_argument("--rate-window", type=float, default=60.0, help="Fenster fuer --rate-limit in Sekunden")
+    serve_parser.add_argument("--seed", type=int, default=None, help="Seed fuer reproduzierbare Fehler und Latenz")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args.fixtures)
+    else:
+        faults = FaultInjector(args.latency, args.jitter, args.error_rate, args.rate_limit, args.rate_window, args.seed)
+        serve(args.fixtures, args.host, args.port, faults)
+
+
+if __name__ == "__main__":
+    main()
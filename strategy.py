@@ -20,14 +20,16 @@ data_processing.fetch_cvdd_from_axeladlerjr.
 """
 
 import pandas as pd
-from datetime import datetime
-from config import STRATEGY_CONFIG, BITCOIN_HALVINGS
+from config import STRATEGY_CONFIG
+from halving import HALVING_INDEX
+from quantiles import expanding_quantiles
 
 
 def calculate_q90_expanding(df):
     """Berechnet rollierenden Q90 für Mayer Multiple."""
     min_periods = STRATEGY_CONFIG['Q_MIN_PERIODS']
-    return df['mayer_multiple'].expanding(min_periods=min_periods).quantile(0.9)
+    q90 = expanding_quantiles(df['mayer_multiple'].to_numpy(dtype=float), (0.9,), min_periods)[:, 0]
+    return pd.Series(q90, index=df.index, name='mayer_multiple')
 
 
 def get_halving_info(current_date=None):
@@ -47,17 +49,7 @@ def get_halving_info(current_date=None):
             'halving_hint': 'Kein Halving-Datum verfügbar'
         }
 
-    if current_date is None:
-        current_date = pd.Timestamp.now()
-    else:
-        current_date = pd.Timestamp(current_date)
-
-    last_halving_date = None
-    for halving_data in BITCOIN_HALVINGS.values():
-        halving_date = pd.Timestamp(halving_data["date"])
-        if halving_date <= current_date:
-            if last_halving_date is None or halving_date > last_halving_date:
-                last_halving_date = halving_date
+    _, last_halving_date = HALVING_INDEX.last_halving(current_date)
 
     in_typical_top_window = 12 <= months <= 24
 
@@ -286,27 +278,56 @@ def calculate_price_levels(df_merged):
     }
 
 
-def months_since_last_halving(current_date=None):
+def _json_value(value):
+    """numpy-/pandas-Skalare in Python-Typen, NaN wird None."""
+    if isinstance(value, dict):
+        return {key: _json_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def signal_status_payload(signal_status, as_of=None):
     """
-    Berechnet Monate seit dem letzten Bitcoin Halving.
+    JSON-taugliche Form von get_signal_status (für CLI und Skripte).
+
+    Args:
+        signal_status: Ergebnis von get_signal_status
+        as_of: Datum des letzten Datenpunkts (Timestamp oder None)
 
     Returns:
-        float: Monate seit letztem Halving, oder None falls kein Halving vor current_date
+        dict wie signal_status plus 'as_of' und 'active' (Labels der aktiven Signale je Seite)
     """
-    if current_date is None:
-        current_date = pd.Timestamp.now()
-    else:
-        current_date = pd.Timestamp(current_date)
+    payload = _json_value(signal_status)
+    for side in ('buy', 'sell'):
+        for signal in payload[side].values():
+            if signal['gap']:
+                # \$ ist nur fuer Streamlit-Markdown escaped
+                signal['gap'] = signal['gap'].replace('\\$', '$')
+    payload['as_of'] = _json_value(as_of)
+    payload['active'] = {
+        side: [signal['label'] for signal in payload[side].values() if signal['active']]
+        for side in ('buy', 'sell')
+    }
+    return payload
 
-    last_halving_date = None
-    for halving_num, halving_data in BITCOIN_HALVINGS.items():
-        halving_date = pd.Timestamp(halving_data["date"])
-        if halving_date <= current_date:
-            if last_halving_date is None or halving_date > last_halving_date:
-                last_halving_date = halving_date
 
-    if last_halving_date is None:
-        return None
+def price_levels_payload(price_levels):
+    """JSON-taugliche Form von calculate_price_levels, NaN wird None."""
+    return _json_value(price_levels)
+
 
-    days_since = (current_date - last_halving_date).days
-    return days_since / 30.44
+def months_since_last_halving(current_date=None):
+    """
+    Berechnet Monate seit dem letzten Bitcoin Halving (über den vorberechneten HALVING_INDEX).
+
+    Returns:
+        float: Monate seit letztem Halving, oder None falls kein Halving vor current_date
+    """
+    return HALVING_INDEX.months_since(current_date)
@@ -0,0 +1,195 @@
+"""
+sweep.py - Paralleler Parameter-Sweep fuer die 4+4 Strategie.
+
+Bewertet ein Raster oder eine Zufallsstichprobe von STRATEGY_CONFIG-Varianten
+(BUY_MM_QUANTILE, SELL_MM_QUANTILE, Q_MIN_PERIODS, F&G-Schwellen, BUY_BLOCK_MONTHS)
+in einem Prozess-Pool. Die Preis- und F&G-Arrays werden einmal vorbereitet (derselbe
+Merge wie in process_and_merge_data) und ueber Shared Memory an die Worker gegeben,
+statt sie pro Aufgabe zu pickeln. Jeder Worker rechnet pro Konfiguration die expanding
+Quantile, die Signal-Codes (compute_signal_codes) und die Trades (trade_indices,
+dieselbe Logik wie calculate_sell_and_buy_history).
+
+Aufruf:
+    python sweep.py                  # volles Raster aus config.SWEEP_SPACE
+    python sweep.py --random 200     # 200 zufaellige Konfigurationen
+    python sweep.py --workers 8 --top 25 --csv sweep.csv
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from config import INDICATORS, STRATEGY_CONFIG, SWEEP_SPACE
+from data_processing import (_merge_base_frames, compute_signal_codes, trade_indices,
+                             process_fear_and_greed_data, process_historical_data)
+from quantiles import expanding_quantiles
+
+# Zeilen des geteilten float64-Blocks
+_CLOSE, _MAYER_MULTIPLE, _FEAR_AND_GREED = range(3)
+
+# Worker-Zustand (pro Prozess, gesetzt in _init_worker)
+_worker_arrays = {}
+
+
+def parameter_grid(space=None):
+    """Alle Kombinationen aus space (dict Schluessel -> Liste von Werten) als Liste von dicts."""
+    space = SWEEP_SPACE if space is None else space
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+
+
+def random_configs(n, space=None, seed=None):
+    """n zufaellige, unterschiedliche Konfigurationen aus space."""
+    grid = parameter_grid(space)
+    return random.Random(seed).sample(grid, min(n, len(grid)))
+
+
+def prepare_sweep_arrays(df_historical_btc, df_fear_and_greed):
+    """
+    Bereitet die Arrays vor, die alle Konfigurationen teilen (SMAs, Mayer Multiple, F&G),
+    mit demselben Merge wie process_and_merge_data.
+    Returns:
+    Tuple (dates als datetime64[ns], float64-Array (3, n) mit close, mayer_multiple, value).
+    """
+    _, df_merged = _merge_base_frames(df_historical_btc, df_fear_and_greed,
+                                      INDICATORS.get("BIGGER_SMA"), INDICATORS.get("SMALLER_SMA"))
+    dates = df_merged["date"].to_numpy(dtype="datetime64[ns]")
+    values = np.vstack([
+        df_merged["close"].to_numpy(dtype=float),
+        df_merged["mayer_multiple"].to_numpy(dtype=float),
+        df_merged["value"].to_numpy(dtype=float),
+    ])
+    return dates, values
+
+
+def _init_worker(dates_name, values_name, n):
+    dates_shm = shared_memory.SharedMemory(name=dates_name)
+    values_shm = shared_memory.SharedMemory(name=values_name)
+    # Referenzen halten, sonst wird der Speicher beim Garbage Collect geschlossen
+    _worker_arrays["shm"] = (dates_shm, values_shm)
+    _worker_arrays["dates"] = np.ndarray((n,), dtype="datetime64[ns]", buffer=dates_shm.buf)
+    _worker_arrays["values"] = np.ndarray((3, n), dtype=np.float64, buffer=values_shm.buf)
+    _cached_quantiles.cache_clear()
+
+
+@lru_cache(maxsize=64)
+def _cached_quantiles(quantile, min_periods):
+    """Expanding Quantil, pro Worker gecacht: viele Konfigurationen teilen dieselben Quantile."""
+    values = _worker_arrays["values"][_MAYER_MULTIPLE]
+    return expanding_quantiles(values, (quantile,), min_periods)[:, 0]
+
+
+def evaluate_config(config, dates, values, q10=None, q90=None):
+    """
+    Backtest einer Konfiguration (Overrides fuer STRATEGY_CONFIG) auf den vorbereiteten Arrays.
+    BUY_FG_THRESHOLD wirkt nur als Kauffilter, wenn der Schluessel im Override steht.
+    Returns:
+    dict mit der Konfiguration und den Kennzahlen.
+    """
+    params = {**STRATEGY_CONFIG, **config}
+    close = values[_CLOSE]
+    mayer_multiple = values[_MAYER_MULTIPLE]
+    fear_and_greed = values[_FEAR_AND_GREED]
+    if q10 is None:
+        q10 = expanding_quantiles(mayer_multiple, (params["BUY_MM_QUANTILE"],), params["Q_MIN_PERIODS"])[:, 0]
+    if q90 is None:
+        q90 = expanding_quantiles(mayer_multiple, (params["SELL_MM_QUANTILE"],), params["Q_MIN_PERIODS"])[:, 0]
+
+    codes = compute_signal_codes(dates, mayer_multiple, q10, q90, fear_and_greed,
+                                 params["SELL_FG_THRESHOLD"], params["BUY_BLOCK_MONTHS"],
+                                 buy_fg_threshold=config.get("BUY_FG_THRESHOLD"))
+    indices = trade_indices(codes, close)
+
+    buys = indices[0::2]
+    sells = indices[1::2]
+    multiple = float(np.prod(close[sells] / close[buys[:len(sells)]]))
+    days_invested = int(np.sum(sells - buys[:len(sells)]))
+    open_position = len(buys) > len(sells)
+    if open_position:
+        multiple *= float(close[-1] / close[buys[-1]])
+        days_invested += len(close) - 1 - int(buys[-1])
+
+    return {
+        **config,
+        "trades": len(indices),
+        "closed_trades": len(sells),
+        "open_position": open_position,
+        "final_multiple": multiple,
+        "exposure": days_invested / max(len(close) - 1, 1),
+    }
+
+
+def _evaluate_in_worker(config):
+    params = {**STRATEGY_CONFIG, **config}
+    q10 = _cached_quantiles(params["BUY_MM_QUANTILE"], params["Q_MIN_PERIODS"])
+    q90 = _cached_quantiles(params["SELL_MM_QUANTILE"], params["Q_MIN_PERIODS"])
+    return evaluate_config(config, _worker_arrays["dates"], _worker_arrays["values"], q10, q90)
+
+
+def run_sweep(df_historical_btc, df_fear_and_greed, configs, max_workers=None):
+    """
+    Bewertet alle configs parallel. Die vorbereiteten Arrays liegen in Shared Memory,
+    die Worker lesen sie ohne Kopie.
+    Returns:
+    DataFrame, absteigend nach final_multiple sortiert (Rang 1 = beste Konfiguration).
+    """
+    dates, values = prepare_sweep_arrays(df_historical_btc, df_fear_and_greed)
+    max_workers = max_workers or os.cpu_count() or 1
+    logging.info("Running sweep over %d configurations on %d rows with %d workers.",
+                 len(configs), len(dates), max_workers)
+
+    dates_shm = shared_memory.SharedMemory(create=True, size=max(dates.nbytes, 1))
+    values_shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    try:
+        np.ndarray(dates.shape, dtype=dates.dtype, buffer=dates_shm.buf)[:] = dates
+        np.ndarray(values.shape, dtype=values.dtype, buffer=values_shm.buf)[:] = values
+
+        chunksize = max(1, len(configs) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(dates_shm.name, values_shm.name, len(dates))) as executor:
+            results = list(executor.map(_evaluate_in_worker, configs, chunksize=chunksize))
+    finally:
+        dates_shm.close()
+        dates_shm.unlink()
+        values_shm.close()
+        values_shm.unlink()
+
+    df_results = pd.DataFrame(results).sort_values("final_multiple", ascending=False, ignore_index=True)
+    df_results.index = df_results.index + 1
+    df_results.index.name = "rank"
+    return df_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parameter-Sweep fuer die 4+4 Strategie")
+    parser.add_argument("--random", type=int, default=None, help="Anzahl zufaelliger Konfigurationen statt vollem Raster")
+    parser.add_argument("--seed", type=int, default=None, help="Seed fuer --random")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Worker-Prozesse (Default: alle Kerne)")
+    parser.add_argument("--top", type=int, default=20, help="Anzahl angezeigter Konfigurationen")
+    parser.add_argument("--csv", default=None, help="Komplette Rangliste als CSV speichern")
+    args = parser.parse_args()
+
+    fear_and_greed_fetched, message, df_fear_and_greed = process_fear_and_greed_data()
+    historical_data_fetched, message_btc, df_historical_btc = process_historical_data()
+    if not (fear_and_greed_fetched and historical_data_fetched):
+        raise SystemExit(f"Data fetch failed: {message} / {message_btc}")
+
+    configs = random_configs(args.random, seed=args.seed) if args.random else parameter_grid()
+    df_results = run_sweep(df_historical_btc, df_fear_and_greed, configs, max_workers=args.workers)
+
+    if args.csv:
+        df_results.to_csv(args.csv)
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(df_results.head(args.top).to_string())
+
+
+if __name__ == "__main__":
+    main()
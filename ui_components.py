@@ -1,18 +1,20 @@
+import functools
+
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
+from datetime import datetime, timedelta
 
-from data_processing import fetch_onchain_data
-from helpers import fetch_and_process_data
-from strategy import get_signal_status, months_since_last_halving
-from config import BITCOIN_HALVINGS, STRATEGY_CONFIG
+from refresh_worker import latest_dashboard_data
+from data_processing import frame_fingerprint, load_onchain_history
+from strategy import get_signal_status
+from halving import HALVING_INDEX
+from downsampling import downsample_series
+from chart_pyramid import RESOLUTIONS, select_view
+from config import CHART_CONFIG, STRATEGY_CONFIG, TIMEFRAME_CONFIG
 
 # Farbrollen aus der dataviz-Skill-Referenzpalette (references/palette.md).
 # Fixe, validierte Werte statt frei erfundener Hex-Codes.
 INK = "#0b0b0b"
-SECONDARY_INK = "#52514e"
+SECONDARY_INK = "#52514e"  # auch MA und Multiple des Zeitrahmens (Woche/Monat)
 MUTED = "#898781"
 GRID = "#e1e0d9"
 SURFACE = "#fcfcfb"
@@ -25,6 +27,21 @@ SEQ_BLUE_LIGHT = "#cde2fb"  # Sequential Blue, Stufe 100, Meter-Track
 
 FONT_FAMILY = 'system-ui, -apple-system, "Segoe UI", sans-serif'
 
+# Zeitraum-Auswahl der Charts: Anzahl Tage bis zum letzten Datenpunkt, None = ganze Historie
+CHART_RANGES = {
+    "90 Tage": 90,
+    "1 Jahr": 365,
+    "4 Jahre": 4 * 365,
+    "Alles": None,
+    "Eigener": "custom",
+}
+
+# Zeitrahmen der Charts: "Auto" bleibt bei Tagesdaten, solange sie ins Zeilen-Budget passen
+CHART_TIMEFRAMES = {"Auto": None, **{label: resolution for resolution, label in RESOLUTIONS.items()}}
+
+# Titel-Zusatz fuer Fear & Greed, in Wochen- und Monatsstufe ist es der Periodenmittelwert
+FG_AVERAGE_SUFFIX = {"W": " (Wochenschnitt)", "M": " (Monatsschnitt)"}
+
 
 def show_app_header(last_date):
     """Zeigt App Header mit einer kurzen Erklärung, die auch Neulinge verstehen."""
@@ -223,22 +240,25 @@ def show_signal_dashboard(signal_status):
         )
 
 
+def show_onchain_age(onchain_stale):
+    """Hinweis, wenn On-Chain Werte beim letzten Refresh nicht aktualisiert werden konnten
+    (Anfragekontingent von bitcoin-data.com aufgebraucht oder Quelle ausgefallen).
+    Die Werte kommen aus dem Snapshot, hier wird nur formatiert."""
+    if onchain_stale:
+        now = datetime.now().timestamp()
+        ages = ", ".join(f"{name} vor {(now - fetched_at) / 3600:.0f} h" for name, fetched_at in onchain_stale.items())
+        st.caption(f":material/schedule: Letzter verfügbarer Stand: {ages}.")
+
+
 def show_halving_cycle():
     """Zeigt Halving-Zyklus"""
     today = datetime.now()
-    months = months_since_last_halving(today)
+    months = HALVING_INDEX.months_since(today)
 
     if months is None:
         return
 
-    last_halving_num = None
-    last_halving_date = None
-    for num, data in BITCOIN_HALVINGS.items():
-        h_date = datetime.strptime(data["date"], "%Y-%m-%d")
-        if h_date <= today:
-            if last_halving_date is None or h_date > last_halving_date:
-                last_halving_num = num
-                last_halving_date = h_date
+    last_halving_num, last_halving_date = HALVING_INDEX.last_halving(today)
 
     months_until_next = max(0, 48 - months)
 
@@ -276,45 +296,101 @@ def _base_layout(title, height=420):
     )
 
 
+def _update_time_axis(fig, df_merged):
+    """X-Achse passend zur Spannweite: Jahres-Ticks für lange, Monats-/Tages-Ticks für kurze Zeiträume."""
+    span_days = (df_merged.index.max() - df_merged.index.min()).days if len(df_merged) else 0
+    if span_days > 3 * 365:
+        dtick, tickformat = "M12", "%Y"
+    elif span_days > 365:
+        dtick, tickformat = "M3", "%m.%Y"
+    elif span_days > 120:
+        dtick, tickformat = "M1", "%m.%Y"
+    else:
+        dtick, tickformat = None, "%d.%m.%Y"
+    fig.update_xaxes(gridcolor=GRID, dtick=dtick, tickformat=tickformat)
+
+
 def _add_halving_markers(fig, df_merged):
     """Fügt Halving-Linien und die Linie 18 Monate danach hinzu, beide mit Beschriftung."""
-    for num, data in BITCOIN_HALVINGS.items():
-        h_date = pd.to_datetime(data["date"])
-        if df_merged.index.min() <= h_date <= df_merged.index.max():
+    start, end = df_merged.index.min(), df_merged.index.max()
+    for num, h_date, h_plus_18 in zip(HALVING_INDEX.numbers, HALVING_INDEX.timestamps, HALVING_INDEX.window_ends(18)):
+        if start <= h_date <= end:
             h_date_str = h_date.strftime('%Y-%m-%d')
             fig.add_vline(x=h_date_str, line=dict(color=MUTED, width=1, dash="dot"))
             fig.add_annotation(x=h_date_str, y=1.0, yref="paper", text=f"Halving {num}",
                                 showarrow=False, yshift=10, font=dict(size=10, color=MUTED))
 
-        h_plus_18 = h_date + relativedelta(months=18)
-        if df_merged.index.min() <= h_plus_18 <= df_merged.index.max():
+        if start <= h_plus_18 <= end:
             h_plus_18_str = h_plus_18.strftime('%Y-%m-%d')
             fig.add_vline(x=h_plus_18_str, line=dict(color=MUTED, width=1, dash="dot"))
             fig.add_annotation(x=h_plus_18_str, y=0.93, yref="paper", text="+18 Mo. nach Halving",
                                 showarrow=False, yshift=10, font=dict(size=9, color=MUTED))
 
 
-def create_price_chart(df_merged, cvdd_current=None):
-    """Chart 1: BTC Preis (Log) mit Q10/Q90-Kauf-/Verkaufszonen und CVDD."""
+@functools.cache
+def _go():
+    """plotly.graph_objects, erst beim ersten Chart geladen (kostet beim Start spuerbar Zeit)."""
+    import plotly.graph_objects as go
+    return go
+
+
+def _line_trace(x, y, log_y=False, **kwargs):
+    """Zeitreihen-Trace mit serverseitigem Downsampling (LTTB). Oberhalb von
+    CHART_CONFIG['WEBGL_THRESHOLD'] Punkten wird per WebGL (Scattergl) gezeichnet."""
+    go = _go()
+    x, y = downsample_series(x, y, log_y=log_y)
+    trace_type = go.Scattergl if len(x) > CHART_CONFIG["WEBGL_THRESHOLD"] else go.Scatter
+    return trace_type(x=x, y=y, **kwargs)
+
+
+def _history_in_range(series, df_merged):
+    """Werte einer On-Chain Historie im Zeitraum von df_merged, None wenn es keine zwei gibt."""
+    if series is None:
+        return None
+    series = series.dropna()
+    series = series[(series.index >= df_merged.index.min()) & (series.index <= df_merged.index.max())]
+    return series if len(series) >= 2 else None
+
+
+def _has_period_column(df_merged, column):
+    return column in df_merged.columns and df_merged[column].notna().any()
+
+
+def create_price_chart(df_merged, cvdd_current=None, cvdd_history=None, resolution="D", timeframe_indicators=False):
+    """Chart 1: BTC Preis (Log) mit Q10/Q90-Kauf-/Verkaufszonen und CVDD
+    (Verlauf aus der lokalen On-Chain Historie, sonst der aktuelle Wert als Linie).
+    Mit timeframe_indicators (Woche/Monat vom Nutzer gewählt) zusätzlich der MA des
+    Zeitrahmens (z.B. 200-Wochen MA)."""
+    go = _go()
     fig = go.Figure()
 
-    fig.add_trace(go.Scatter(x=df_merged.index, y=df_merged['close'], name='BTC Preis',
+    fig.add_trace(_line_trace(df_merged.index, df_merged['close'], log_y=True, name='BTC Preis',
                               line=dict(color=INK, width=2),
                               hovertemplate='%{x|%d.%m.%Y}<br>$%{y:,.0f}<extra></extra>'))
-    fig.add_trace(go.Scatter(x=df_merged.index, y=df_merged['200_days_sma_for_mm'], name='200-Tage MA',
+    fig.add_trace(_line_trace(df_merged.index, df_merged['200_days_sma_for_mm'], log_y=True, name='200-Tage MA',
                               line=dict(color=CAT_YELLOW, width=2, dash='dot'),
                               hovertemplate='$%{y:,.0f}<extra></extra>'))
+    if timeframe_indicators and resolution in TIMEFRAME_CONFIG and _has_period_column(df_merged, 'period_ma'):
+        fig.add_trace(_line_trace(df_merged.index, df_merged['period_ma'], log_y=True,
+                                  name=TIMEFRAME_CONFIG[resolution]['LABEL'],
+                                  line=dict(color=SECONDARY_INK, width=2),
+                                  hovertemplate='$%{y:,.0f}<extra></extra>'))
 
     if 'q90_price_level' in df_merged.columns:
-        fig.add_trace(go.Scatter(x=df_merged.index, y=df_merged['q90_price_level'], name='MM Q90 Preis (Verkauf)',
+        fig.add_trace(_line_trace(df_merged.index, df_merged['q90_price_level'], log_y=True, name='MM Q90 Preis (Verkauf)',
                                   line=dict(color=CRITICAL, width=2, dash='dash'),
                                   hovertemplate='$%{y:,.0f}<extra></extra>'))
     if 'q10_price_level' in df_merged.columns:
-        fig.add_trace(go.Scatter(x=df_merged.index, y=df_merged['q10_price_level'], name='MM Q10 Preis (Kauf)',
+        fig.add_trace(_line_trace(df_merged.index, df_merged['q10_price_level'], log_y=True, name='MM Q10 Preis (Kauf)',
                                   line=dict(color=GOOD, width=2, dash='dash'),
                                   hovertemplate='$%{y:,.0f}<extra></extra>'))
 
-    if cvdd_current is not None:
+    cvdd_history = _history_in_range(cvdd_history, df_merged)
+    if cvdd_history is not None:
+        fig.add_trace(_line_trace(cvdd_history.index, cvdd_history, log_y=True, name='CVDD (inoffizielle Quelle)',
+                                  line=dict(color=CAT_VIOLET, width=2, dash='dashdot'),
+                                  hovertemplate='$%{y:,.0f}<extra></extra>'))
+    elif cvdd_current is not None:
         # Als echte Linie (Trace) statt Annotation: Text-Annotationen auf einer
         # log-skalierten Y-Achse werden von Plotly/Kaleido in dieser Version nicht
         # zuverlässig gerendert (isoliert getestet und bestätigt). Eine Linie mit
@@ -329,44 +405,53 @@ def create_price_chart(df_merged, cvdd_current=None):
     price_labels = ['$1K', '$2K', '$5K', '$10K', '$20K', '$50K', '$100K', '$200K', '$500K']
     fig.update_yaxes(type='log', title='Preis', gridcolor=GRID, zeroline=False,
                       tickvals=price_ticks, ticktext=price_labels)
-    fig.update_xaxes(gridcolor=GRID, dtick="M12", tickformat="%Y")
+    _update_time_axis(fig, df_merged)
     fig.update_layout(**_base_layout('BTC Preis (Log) mit Kauf- und Verkaufszonen', height=540))
 
     _add_halving_markers(fig, df_merged)
     return fig
 
 
-def create_mayer_multiple_chart(df_merged):
-    """Chart 2: Mayer Multiple mit rollierendem Q10/Q90."""
+def create_mayer_multiple_chart(df_merged, resolution="D", timeframe_indicators=False):
+    """Chart 2: Mayer Multiple mit rollierendem Q10/Q90. Mit timeframe_indicators (Woche/Monat
+    vom Nutzer gewählt) zusätzlich das Multiple auf den MA des Zeitrahmens
+    (Schlusskurs / z.B. 200-Wochen MA)."""
+    go = _go()
     fig = go.Figure()
 
-    fig.add_trace(go.Scatter(x=df_merged.index, y=df_merged['mayer_multiple'], name='Mayer Multiple',
+    fig.add_trace(_line_trace(df_merged.index, df_merged['mayer_multiple'], name='Mayer Multiple',
                               line=dict(color=CAT_BLUE, width=2), hovertemplate='%{y:.2f}<extra></extra>'))
+    if (timeframe_indicators and resolution in TIMEFRAME_CONFIG
+            and _has_period_column(df_merged, 'period_mayer_multiple')):
+        fig.add_trace(_line_trace(df_merged.index, df_merged['period_mayer_multiple'],
+                                  name=f"Preis / {TIMEFRAME_CONFIG[resolution]['LABEL']}",
+                                  line=dict(color=SECONDARY_INK, width=2, dash='dot'), hovertemplate='%{y:.2f}<extra></extra>'))
     if 'q90_expanding' in df_merged.columns:
-        fig.add_trace(go.Scatter(x=df_merged.index, y=df_merged['q90_expanding'], name='Q90 (Verkauf)',
+        fig.add_trace(_line_trace(df_merged.index, df_merged['q90_expanding'], name='Q90 (Verkauf)',
                                   line=dict(color=CRITICAL, width=2, dash='dash'), hovertemplate='%{y:.2f}<extra></extra>'))
     if 'q10_expanding' in df_merged.columns:
-        fig.add_trace(go.Scatter(x=df_merged.index, y=df_merged['q10_expanding'], name='Q10 (Kauf)',
+        fig.add_trace(_line_trace(df_merged.index, df_merged['q10_expanding'], name='Q10 (Kauf)',
                                   line=dict(color=GOOD, width=2, dash='dash'), hovertemplate='%{y:.2f}<extra></extra>'))
 
     fig.add_hline(y=1.0, line=dict(color=MUTED, width=1),
                   annotation_text='MM = 1 (Preis entspricht 200-Tage-Durchschnitt)',
                   annotation_position='bottom left', annotation_font=dict(color=MUTED, size=9))
     fig.update_yaxes(range=[0, 4], title='Mayer Multiple', gridcolor=GRID, zeroline=False)
-    fig.update_xaxes(gridcolor=GRID, dtick="M12", tickformat="%Y")
+    _update_time_axis(fig, df_merged)
     fig.update_layout(**_base_layout('Mayer Multiple mit Q10 / Q90 (rolling)', height=440))
 
     _add_halving_markers(fig, df_merged)
     return fig
 
 
-def create_fear_greed_chart(df_merged):
-    """Chart 3: Fear & Greed Index mit Kauf-/Verkaufsschwellen."""
+def create_fear_greed_chart(df_merged, resolution="D"):
+    """Chart 3: Fear & Greed Index mit Kauf-/Verkaufsschwellen (Woche/Monat: Periodenmittelwert)."""
     buy_fg = STRATEGY_CONFIG['BUY_FG_THRESHOLD']
     sell_fg = STRATEGY_CONFIG['SELL_FG_THRESHOLD']
 
+    go = _go()
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df_merged.index, y=df_merged['value'], name='Fear & Greed',
+    fig.add_trace(_line_trace(df_merged.index, df_merged['value'], name='Fear & Greed',
                               line=dict(color=CAT_BLUE, width=2), fill='tozeroy',
                               fillcolor='rgba(42,120,214,0.1)', hovertemplate='%{y:.0f}<extra></extra>'))
 
@@ -379,20 +464,45 @@ def create_fear_greed_chart(df_merged):
                   annotation_position='top left', annotation_bgcolor=label_bg)
 
     fig.update_yaxes(range=[0, 100], title='Index', gridcolor=GRID, zeroline=False)
-    fig.update_xaxes(gridcolor=GRID, dtick="M12", tickformat="%Y")
-    fig.update_layout(**_base_layout('Fear & Greed Index', height=300))
+    _update_time_axis(fig, df_merged)
+    fig.update_layout(**_base_layout('Fear & Greed Index' + FG_AVERAGE_SUFFIX.get(resolution, ''), height=300))
     fig.update_layout(showlegend=False)  # nur eine Kurve, Titel sagt bereits was geplottet ist
 
     _add_halving_markers(fig, df_merged)
     return fig
 
 
+def create_mvrv_history_chart(df_merged, mvrv_history):
+    """MVRV-Z Verlauf aus der lokalen On-Chain Historie mit Verkaufsschwelle,
+    None wenn im Zeitraum keine Historie vorliegt."""
+    mvrv_history = _history_in_range(mvrv_history, df_merged)
+    if mvrv_history is None:
+        return None
+    threshold = STRATEGY_CONFIG['MVRV_SELL_THRESHOLD']
+
+    go = _go()
+    fig = go.Figure()
+    fig.add_trace(_line_trace(mvrv_history.index, mvrv_history, name='MVRV-Z',
+                              line=dict(color=CAT_BLUE, width=2), hovertemplate='%{x|%d.%m.%Y}<br>%{y:.2f}<extra></extra>'))
+    fig.add_hline(y=threshold, line=dict(color=CRITICAL, width=1.5, dash='dash'),
+                  annotation_text=f'Verkaufszone ≥ {threshold}', annotation_font=dict(color=CRITICAL, size=11),
+                  annotation_position='top left', annotation_bgcolor='rgba(252,252,251,0.85)')
+    fig.update_yaxes(title='MVRV-Z Score', gridcolor=GRID, zeroline=False)
+    _update_time_axis(fig, df_merged)
+    fig.update_layout(**_base_layout('MVRV-Z Score, Verlauf (On-Chain)', height=300))
+    fig.update_layout(showlegend=False)
+
+    _add_halving_markers(fig, df_merged)
+    return fig
+
+
 def create_mvrv_meter(mvrv_current):
-    """Chart 4: MVRV-Z als Meter (aktueller Wert gegen Verkaufsschwelle) statt Zeitreihe.
-    Es liegt ohnehin keine brauchbare Historie vor (siehe fetch_onchain_data)."""
+    """Chart 4: MVRV-Z als Meter (aktueller Wert gegen Verkaufsschwelle). Den Verlauf zeigt
+    create_mvrv_history_chart, sobald die lokale On-Chain Historie befuellt ist."""
     threshold = STRATEGY_CONFIG['MVRV_SELL_THRESHOLD']
     gauge_max = max(threshold * 1.6, (mvrv_current or 0) * 1.2, 8)
 
+    go = _go()
     fig = go.Figure()
 
     # Track (unfilled), hellere Stufe derselben Rampe
@@ -420,16 +530,95 @@ def create_mvrv_meter(mvrv_current):
     return fig
 
 
+def _select_chart_range(df_merged):
+    """Zeitraum-Auswahl für die Charts. Returns: (start, end), start None = ganze Historie."""
+    end = df_merged.index[-1]
+    choice = st.segmented_control("Zeitraum", list(CHART_RANGES), default="Alles", key="chart_range")
+    if choice == "Eigener":
+        picked = st.date_input("Von / Bis", value=(end - timedelta(days=365), end),
+                               min_value=df_merged.index[0], max_value=end, format="DD.MM.YYYY")
+        if len(picked) == 2:
+            return picked[0], picked[1]
+        return None, end
+    days = CHART_RANGES.get(choice)
+    return (None, end) if days is None else (end - timedelta(days=days), end)
+
+
+# Builder pro Chart: (df_chart, On-Chain Historie oder None, *Werte) -> Figure oder None
+CHART_BUILDERS = {
+    "price": lambda df_chart, history, resolution, timeframe_indicators, cvdd_current: create_price_chart(
+        df_chart, cvdd_current, history["cvdd"] if history is not None else None, resolution, timeframe_indicators),
+    "mayer_multiple": lambda df_chart, _, resolution, timeframe_indicators: create_mayer_multiple_chart(
+        df_chart, resolution, timeframe_indicators),
+    "fear_greed": lambda df_chart, _, resolution: create_fear_greed_chart(df_chart, resolution),
+    "mvrv_history": lambda df_chart, history: create_mvrv_history_chart(
+        df_chart, history["mvrv"] if history is not None else None),
+    "mvrv_meter": lambda _, __, mvrv_current: create_mvrv_meter(mvrv_current),
+}
+
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def _cached_figure(chart, _df_chart, _history, view_key, *values):
+    """
+    Fertige Figure pro Chart, Datenstand, Ausschnitt und On-Chain-Wert, geteilt über alle
+    Sessions. view_key = (data_version, Auflösung, erstes und letztes Datum, Stand der
+    On-Chain Historie) bestimmt _df_chart und _history eindeutig. Die Figures werden von st.plotly_chart nur gelesen und dürfen
+    nicht verändert werden. Die Farben sind fest (siehe Palette oben), das Theme
+    gehört deshalb nicht zum Schlüssel.
+    """
+    return CHART_BUILDERS[chart](_df_chart, _history, *values)
+
+
+@st.fragment
+def show_charts_section(df_merged, timeframes, cvdd_current, mvrv_current):
+    """
+    Charts, standardmaessig ausgeblendet: auf dem Handy belegen die vier Charts sonst
+    enorm viel Scrollweg, und die meisten Besucher schauen nur auf die Signale.
+    Die Figures werden erst gebaut, wenn der Toggle aktiv ist (ein eingeklappter
+    Expander wuerde seinen Inhalt trotzdem bei jedem Rerun ausfuehren). Als Fragment
+    laufen Toggle und Zeitraum-Auswahl nur diesen Abschnitt neu, nicht die ganze Seite.
+    Die Zeitrahmen (Tag/Woche/Monat) kommen fertig berechnet aus dem Snapshot, ein
+    Wechsel schneidet nur aus.
+    """
+    if not st.toggle(":material/monitoring: Charts anzeigen", value=False, key="show_charts"):
+        return
+
+    # Der gewaehlte Zeitraum wird per binaerer Suche aus der passenden Aufloesung geschnitten
+    # (Tag/Woche/Monat, siehe chart_pyramid), statt immer die ganze Tageshistorie zu zeichnen.
+    start, end = _select_chart_range(df_merged)
+    timeframe = st.segmented_control("Zeitrahmen", list(CHART_TIMEFRAMES), default="Auto", key="chart_timeframe")
+    # Auto bleibt bei Tagesdaten (LTTB begrenzt die Punkte), MA und Multiple des Zeitrahmens
+    # gibt es nur, wenn Woche oder Monat ausdruecklich gewaehlt ist
+    selected_resolution = CHART_TIMEFRAMES.get(timeframe)
+    timeframe_indicators = selected_resolution is not None
+    resolution, df_chart = select_view(timeframes, start, end, CHART_CONFIG["AUTO_MAX_ROWS"], selected_resolution)
+    if df_chart.empty:
+        st.info("Keine Daten im gewählten Zeitraum.")
+    else:
+        st.caption(f"Auflösung: {RESOLUTIONS[resolution]} ({len(df_chart)} Punkte)")
+        history = load_onchain_history()
+        view_key = (df_merged.attrs.get("data_version"), resolution, df_chart.index[0], df_chart.index[-1],
+                    frame_fingerprint(history))
+        st.plotly_chart(_cached_figure("price", df_chart, history, view_key, resolution, timeframe_indicators,
+                                       cvdd_current), width='stretch')
+        st.plotly_chart(_cached_figure("mayer_multiple", df_chart, history, view_key, resolution,
+                                       timeframe_indicators), width='stretch')
+        st.plotly_chart(_cached_figure("fear_greed", df_chart, history, view_key, resolution), width='stretch')
+        mvrv_history_chart = _cached_figure("mvrv_history", df_chart, history, view_key)
+        if mvrv_history_chart is not None:
+            st.plotly_chart(mvrv_history_chart, width='stretch')
+    st.plotly_chart(_cached_figure("mvrv_meter", None, None, None, mvrv_current), width='stretch')
+
+
 def loadUiComponents():
     """Hauptfunktion zum Laden aller UI-Komponenten"""
-    # Marktdaten laden
-    data_merged, message, df_merged = fetch_and_process_data()
+    # Markt- und On-Chain Daten (CVDD, MVRV-Z, Markt-/realisierte Kapitalisierung) aus dem
+    # letzten Snapshot des Hintergrund-Refreshs, ohne im Request auf Netzwerkzugriffe zu warten
+    data_merged, message, df_merged, onchain, source_status, timeframes, onchain_stale = latest_dashboard_data()
     if not data_merged:
         st.error(message)
         return
-
-    # On-Chain Daten laden (CVDD, MVRV-Z, Markt-/realisierte Kapitalisierung)
-    cvdd_current, mvrv_current, market_cap_current, realized_cap_current = fetch_onchain_data()
+    cvdd_current, mvrv_current, market_cap_current, realized_cap_current = onchain
 
     # App Header
     last_date = df_merged.index[-1].strftime('%d.%m.%Y')
@@ -445,6 +634,7 @@ def loadUiComponents():
     signal_status = get_signal_status(df_merged, cvdd_current, mvrv_current,
                                        market_cap_current, realized_cap_current)
     show_signal_dashboard(signal_status)
+    show_onchain_age(onchain_stale)
 
     st.divider()
 
@@ -453,10 +643,5 @@ def loadUiComponents():
 
     st.divider()
 
-    # 3. Charts, standardmaessig eingeklappt: auf dem Handy belegen die vier Charts
-    # sonst enorm viel Scrollweg, auf dem Desktop kostet das Aufklappen einen Klick.
-    with st.expander(":material/monitoring: Charts anzeigen", expanded=False):
-        st.plotly_chart(create_price_chart(df_merged, cvdd_current), width='stretch')
-        st.plotly_chart(create_mayer_multiple_chart(df_merged), width='stretch')
-        st.plotly_chart(create_fear_greed_chart(df_merged), width='stretch')
-        st.plotly_chart(create_mvrv_meter(mvrv_current), width='stretch')
+    # 3. Charts
+    show_charts_section(df_merged, timeframes, cvdd_current, mvrv_current)